@@ -15,6 +15,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 import voluptuous as vol
 
 from .const import (
@@ -25,11 +26,25 @@ from .const import (
     CONF_UID,
     CONF_NICKNAME,
     CONF_CHANNEL_MASTER_ID,
+    CONF_SCAN_INTERVAL,
+    CONF_FLEET_MODE,
+    CONF_TOKEN_LIFETIME,
+    DATA_UID_INDEX,
     PLATFORMS,
+    SIGN_MAX_CONCURRENCY,
+    HOT_APPLY_OPTIONS,
+    SIGNAL_ENTRY_UNLOADED,
 )
 from .api import SklandClient, Credential
-from .coordinator import ArknightsDataUpdateCoordinator
-from .websocket import async_register_websocket_api
+from .coordinator import (
+    ArknightsDataUpdateCoordinator,
+    async_register_credential,
+    get_credential_manager,
+    get_snapshot_store,
+)
+from .attendance import async_get_attendance_ledger
+from .ticker import async_get_clock_ticker
+from .timeseries import AccountTimeSeriesStore, async_track_coordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,9 +72,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     session = async_get_clientsession(hass)
     client = SklandClient(cred, session)
 
-    # 获取更新间隔
-    scan_interval = entry.options.get("scan_interval", 10)
+    # 获取更新间隔；集群模式下由集群协调器统一调度，协调器自身不轮询
+    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, 10)
     update_interval = timedelta(minutes=scan_interval)
+    fleet_mode = entry.options.get(CONF_FLEET_MODE, False)
 
     # 凭证更新回调：将新凭证持久化到 config_entry
     async def on_credential_update(new_cred: Credential) -> None:
@@ -70,6 +86,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.config_entries.async_update_entry(entry, data=new_data)
         _LOGGER.info("已将新凭证保存到配置")
 
+    # 登记到凭证管理器：同一原始 token 下的角色共用一次刷新/重新认证，
+    # 并在 token 过期前主动刷新（有效期未配置时从被动刷新中学习）
+    token_lifetime = entry.options.get(CONF_TOKEN_LIFETIME, 0)
+    entry.async_on_unload(
+        async_register_credential(
+            hass,
+            entry.data[CONF_TOKEN],
+            client,
+            on_credential_update,
+            token_lifetime * 60 if token_lifetime else None,
+        )
+    )
+
+    # 签到记录：当天已签到的角色不再发送签到请求
+    attendance = await async_get_attendance_ledger(hass)
+
     # 创建数据协调器
     coordinator = ArknightsDataUpdateCoordinator(
         hass,
@@ -77,31 +109,67 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         uid=entry.data[CONF_UID],
         nickname=entry.data[CONF_NICKNAME],
         original_token=entry.data[CONF_TOKEN],
-        on_credential_update=on_credential_update,
-        update_interval=update_interval,
+        credentials=get_credential_manager(hass),
+        update_interval=None if fleet_mode else update_interval,
+        entry_id=entry.entry_id,
+        attendance=attendance,
     )
 
-    # 首次获取数据
-    await coordinator.async_config_entry_first_refresh()
+    # 首次获取数据：有快照时先用快照恢复实体，后台再刷新；否则阻塞等待首次刷新
+    if await coordinator.async_restore_snapshot():
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN}_{entry.data[CONF_UID]}_first_refresh",
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     # 保存协调器
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "client": client,
         "channel_master_id": entry.data[CONF_CHANNEL_MASTER_ID],
+        "timeseries": async_track_coordinator(hass, entry, coordinator),
+        # 当前生效的选项，用于判断选项变化能否直接应用
+        "options": dict(entry.options),
+        "fleet": fleet_mode,
     }
 
+    # 每小时将时间序列聚合导入长期统计（按需导入，依赖记录器）
+    from .statistics import async_setup_statistics
+    async_setup_statistics(
+        hass, entry, coordinator, hass.data[DOMAIN][entry.entry_id]["timeseries"]
+    )
+
     # 设置平台
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # 集群模式：加入集成共用的账号集群调度
+    if fleet_mode:
+        from .fleet import async_get_fleet
+        entry.async_on_unload(async_get_fleet(hass).async_add(coordinator, update_interval))
+
+    # 加入集成共用的时钟刻度，定时推算理智等时间相关的实体值
+    entry.async_on_unload(async_get_clock_ticker(hass).async_add_coordinator(coordinator))
+
+    # 加入每日自动签到调度（是否启用以选项为准）
+    from .sign import async_get_sign_scheduler
+    scheduler = await async_get_sign_scheduler(hass)
+    entry.async_on_unload(scheduler.async_add_entry(entry.entry_id))
+
     # 注册服务
     await _async_setup_services(hass)
 
-    # 注册 WebSocket API
+    # 注册 WebSocket API（按需导入）
+    from .websocket import async_register_websocket_api
     await async_register_websocket_api(hass)
 
     # 监听选项更新
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    # 全部设置成功后才加入 UID 索引，设置失败时 WebSocket 不会查到失效的协调器
+    hass.data.setdefault(DATA_UID_INDEX, {})[entry.data[CONF_UID]] = coordinator
 
     return True
 
@@ -113,15 +181,58 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["timeseries"].async_flush()
+        hass.data.get(DATA_UID_INDEX, {}).pop(entry.data[CONF_UID], None)
+        # 结束绑定在旧协调器上的 WebSocket 订阅
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
 
     return unload_ok
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """重新加载配置条目。"""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """删除配置条目时清理持久化快照、时间序列与签到记录。"""
+    await get_snapshot_store(hass, entry.entry_id).async_remove()
+    await AccountTimeSeriesStore(hass, entry.data[CONF_UID]).async_remove()
+    attendance = await async_get_attendance_ledger(hass)
+    await attendance.async_remove(entry.data[CONF_UID])
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """配置条目更新时应用选项。
+
+    轮询间隔与自动签到相关选项直接应用到运行中的协调器和调度器；
+    其他选项（如是否记录易变属性）需要重新加载配置条目。
+    仅数据变化（如凭证持久化）时不做任何处理。
+    """
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data is None:
+        return
+
+    old_options, new_options = data["options"], dict(entry.options)
+    changed = {
+        key
+        for key in old_options.keys() | new_options.keys()
+        if old_options.get(key) != new_options.get(key)
+    }
+    if not changed:
+        return
+
+    if changed - HOT_APPLY_OPTIONS:
+        _LOGGER.debug("选项变化需要重新加载: %s", sorted(changed - HOT_APPLY_OPTIONS))
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    data["options"] = new_options
+    if CONF_SCAN_INTERVAL in changed:
+        update_interval = timedelta(minutes=new_options.get(CONF_SCAN_INTERVAL, 10))
+        if data["fleet"]:
+            from .fleet import async_get_fleet
+            async_get_fleet(hass).async_set_interval(entry.data[CONF_UID], update_interval)
+        else:
+            await data["coordinator"].async_set_update_interval(update_interval)
+    # 自动签到调度器每次检查时读取最新选项，无需额外处理
+    _LOGGER.debug("已直接应用选项: %s", sorted(changed))
 
 
 async def _async_setup_services(hass: HomeAssistant) -> None:
@@ -129,6 +240,13 @@ async def _async_setup_services(hass: HomeAssistant) -> None:
 
     async def async_sign_service(call: ServiceCall) -> None:
         """签到服务处理器。"""
+        from homeassistant.components import persistent_notification
+        from .sign import (
+            SIGN_SUMMARY_NOTIFICATION_ID,
+            async_sign_entries,
+            format_sign_summary,
+        )
+
         entry_id = call.data.get("entry_id")
 
         # 如果没有指定 entry_id，对所有角色签到
@@ -137,25 +255,19 @@ async def _async_setup_services(hass: HomeAssistant) -> None:
         else:
             entries = list(hass.data[DOMAIN].keys())
 
-        for eid in entries:
-            if eid not in hass.data[DOMAIN]:
-                continue
-
-            data = hass.data[DOMAIN][eid]
-            coordinator = data["coordinator"]
-            channel_master_id = data["channel_master_id"]
-
-            result = await coordinator.async_sign(channel_master_id)
-            _LOGGER.info("签到结果 [%s]: %s", coordinator.nickname, result["message"])
-            
-            # 发送持久化通知
-            from homeassistant.components import persistent_notification
-            persistent_notification.async_create(
-                hass,
-                f"角色: {coordinator.nickname}\n结果: {result['message']}",
-                title="明日方舟签到结果",
-                notification_id=f"arknights_sign_{eid}"
-            )
+        results = await async_sign_entries(
+            hass, entries, call.data.get("max_concurrency", SIGN_MAX_CONCURRENCY)
+        )
+        if not results:
+            return
+
+        # 汇总为一条持久化通知
+        persistent_notification.async_create(
+            hass,
+            format_sign_summary(hass, results),
+            title="明日方舟签到结果",
+            notification_id=SIGN_SUMMARY_NOTIFICATION_ID,
+        )
 
     # 只注册一次服务
     if not hass.services.has_service(DOMAIN, "sign"):
@@ -166,6 +278,9 @@ async def _async_setup_services(hass: HomeAssistant) -> None:
             schema=vol.Schema(
                 {
                     vol.Optional("entry_id"): cv.string,
+                    vol.Optional("max_concurrency"): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=20)
+                    ),
                 }
             ),
         )
@@ -1,15 +1,35 @@
 """API 模块。"""
 
-from .auth import SklandAuth
+from typing import TYPE_CHECKING
+
 from .client import SklandClient
+from .clock import Clock, ManualClock, game_day, system_clock
+from .credentials import CredentialManager
 from .models import Credential, PlayerStatus, SanityInfo, SignResult, BindingCharacter
 
+if TYPE_CHECKING:
+    from .auth import SklandAuth
+
 __all__ = [
     "SklandAuth",
     "SklandClient",
+    "CredentialManager",
+    "Clock",
+    "ManualClock",
+    "system_clock",
+    "game_day",
     "Credential",
     "PlayerStatus",
     "SanityInfo",
     "SignResult",
     "BindingCharacter",
 ]
+
+
+def __getattr__(name: str):
+    """按需导入认证模块（仅在配置或 token 失效时才需要）。"""
+    if name == "SklandAuth":
+        from .auth import SklandAuth
+
+        return SklandAuth
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
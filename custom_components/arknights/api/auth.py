@@ -5,11 +5,12 @@ Copyright (c) 2025 FrostN0v0
 MIT License
 """
 
+import asyncio
 import logging
 
-import httpx
+import aiohttp
 
-from ..const import HYPERGRYPH_BASE_URL, SKLAND_BASE_URL, SKLAND_APP_CODE, USER_AGENT
+from .const import HYPERGRYPH_BASE_URL, SKLAND_BASE_URL, SKLAND_APP_CODE, USER_AGENT
 from .models import Credential
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,15 +23,43 @@ class AuthError(Exception):
 
 
 class SklandAuth:
-    """森空岛认证客户端。"""
+    """森空岛认证客户端。
 
-    def __init__(self) -> None:
+    使用调用方提供的 aiohttp 会话（通常与 SklandClient 共用），
+    以便复用连接池与 TLS 会话。
+    """
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        """初始化认证客户端。
+
+        Args:
+            session: aiohttp 会话
+        """
+        self._session = session
         self._headers = {
             "User-Agent": USER_AGENT,
             "Accept-Encoding": "gzip",
-            "Connection": "close",
         }
 
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        """发送请求并解析 JSON 响应。
+
+        Raises:
+            AuthError: 网络请求失败
+        """
+        try:
+            async with self._session.request(
+                method,
+                url,
+                timeout=aiohttp.ClientTimeout(total=10.0),
+                **kwargs,
+            ) as response:
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise AuthError(f"网络请求失败: {e}") from e
+        except ValueError as e:
+            raise AuthError(f"响应格式无效: {e}") from e
+
     async def get_grant_code(self, token: str) -> str:
         """使用 token 获取认证代码。
 
@@ -43,28 +72,22 @@ class SklandAuth:
         Raises:
             AuthError: 认证失败
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{HYPERGRYPH_BASE_URL}/user/oauth2/v2/grant",
-                    json={
-                        "appCode": SKLAND_APP_CODE,
-                        "token": token,
-                        "type": 0,
-                    },
-                    headers=self._headers,
-                    timeout=10.0,
-                )
-                data = response.json()
-
-                if data.get("status") != 0:
-                    msg = data.get("msg", "未知错误")
-                    raise AuthError(f"获取认证代码失败: {msg}")
-
-                return data["data"]["code"]
-
-            except httpx.HTTPError as e:
-                raise AuthError(f"网络请求失败: {e}") from e
+        data = await self._request(
+            "post",
+            f"{HYPERGRYPH_BASE_URL}/user/oauth2/v2/grant",
+            json={
+                "appCode": SKLAND_APP_CODE,
+                "token": token,
+                "type": 0,
+            },
+            headers=self._headers,
+        )
+
+        if data.get("status") != 0:
+            msg = data.get("msg", "未知错误")
+            raise AuthError(f"获取认证代码失败: {msg}")
+
+        return data["data"]["code"]
 
     async def get_cred(self, grant_code: str) -> Credential:
         """使用认证代码获取凭证。
@@ -78,29 +101,23 @@ class SklandAuth:
         Raises:
             AuthError: 认证失败
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{SKLAND_BASE_URL}/user/auth/generate_cred_by_code",
-                    json={"code": grant_code, "kind": 1},
-                    headers=self._headers,
-                    timeout=10.0,
-                )
-                data = response.json()
-
-                if data.get("code") != 0:
-                    msg = data.get("message", "未知错误")
-                    raise AuthError(f"获取凭证失败: {msg}")
-
-                cred_data = data["data"]
-                return Credential(
-                    cred=cred_data["cred"],
-                    token=cred_data["token"],
-                    user_id=cred_data.get("userId"),
-                )
-
-            except httpx.HTTPError as e:
-                raise AuthError(f"网络请求失败: {e}") from e
+        data = await self._request(
+            "post",
+            f"{SKLAND_BASE_URL}/user/auth/generate_cred_by_code",
+            json={"code": grant_code, "kind": 1},
+            headers=self._headers,
+        )
+
+        if data.get("code") != 0:
+            msg = data.get("message", "未知错误")
+            raise AuthError(f"获取凭证失败: {msg}")
+
+        cred_data = data["data"]
+        return Credential(
+            cred=cred_data["cred"],
+            token=cred_data["token"],
+            user_id=cred_data.get("userId"),
+        )
 
     async def refresh_token(self, cred: str) -> str:
         """刷新 token。
@@ -114,23 +131,17 @@ class SklandAuth:
         Raises:
             AuthError: 刷新失败
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{SKLAND_BASE_URL}/auth/refresh",
-                    headers={**self._headers, "cred": cred},
-                    timeout=10.0,
-                )
-                data = response.json()
-
-                if data.get("code") != 0:
-                    msg = data.get("message", "未知错误")
-                    raise AuthError(f"刷新 token 失败: {msg}")
-
-                return data["data"]["token"]
-
-            except httpx.HTTPError as e:
-                raise AuthError(f"网络请求失败: {e}") from e
+        data = await self._request(
+            "get",
+            f"{SKLAND_BASE_URL}/auth/refresh",
+            headers={**self._headers, "cred": cred},
+        )
+
+        if data.get("code") != 0:
+            msg = data.get("message", "未知错误")
+            raise AuthError(f"刷新 token 失败: {msg}")
+
+        return data["data"]["token"]
 
     async def authenticate(self, token: str) -> Credential:
         """完整的认证流程：token -> grant_code -> cred。
@@ -0,0 +1,311 @@
+"""森空岛批量采集命令行工具。
+
+不依赖 Home Assistant，按配置文件定时轮询多个账号，
+将玩家数据快照写入 JSON Lines 或 SQLite 文件。
+
+用法（在集成目录 custom_components/arknights 下执行）::
+
+    python -m api.cli config.json
+    python -m api.cli config.json --once --output snapshots.sqlite
+
+配置文件示例::
+
+    {
+        "accounts": [
+            {"token": "<森空岛 token>"},
+            {"token": "<森空岛 token>", "uids": ["12345678"]}
+        ],
+        "interval": 600,
+        "concurrency": 4,
+        "output": "snapshots.jsonl",
+        "parse_workers": 0
+    }
+
+未指定 uids 时采集该 token 绑定的全部明日方舟角色。
+可选的 token_lifetime 为 token 有效期（秒），用于在过期前主动刷新；
+省略时从过期情况中学习。
+parse_workers 大于 0 时在进程池中解析玩家数据，避免阻塞事件循环。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from .auth import AuthError, SklandAuth
+from .client import RequestError, SklandClient, parse_player_info
+from .clock import Clock, system_clock
+from .credentials import CredentialManager
+from .models import PlayerStatus
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 600
+DEFAULT_CONCURRENCY = 4
+DEFAULT_OUTPUT = "snapshots.jsonl"
+
+
+@dataclass
+class _Account:
+    """待采集的角色。"""
+
+    token: str
+    client: SklandClient
+    uid: str
+
+
+class JsonLinesSink:
+    """以 JSON Lines 格式追加写入快照。"""
+
+    def __init__(self, path: Path) -> None:
+        """初始化输出。"""
+        self._file = path.open("a", encoding="utf-8")
+
+    def write(self, uid: str, fetched_at: float, player: PlayerStatus) -> None:
+        """写入一条快照。"""
+        record = {"uid": uid, "fetched_at": fetched_at, "player": player.as_dict()}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """关闭输出。"""
+        self._file.close()
+
+
+class SqliteSink:
+    """写入 SQLite 数据库的 snapshots 表。"""
+
+    def __init__(self, path: Path) -> None:
+        """初始化输出。"""
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "uid TEXT NOT NULL, fetched_at REAL NOT NULL, player TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS snapshots_uid_time ON snapshots (uid, fetched_at)"
+        )
+        self._conn.commit()
+
+    def write(self, uid: str, fetched_at: float, player: PlayerStatus) -> None:
+        """写入一条快照。"""
+        self._conn.execute(
+            "INSERT INTO snapshots (uid, fetched_at, player) VALUES (?, ?, ?)",
+            (uid, fetched_at, json.dumps(player.as_dict(), ensure_ascii=False)),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """关闭输出。"""
+        self._conn.close()
+
+
+def open_sink(path: Path) -> JsonLinesSink | SqliteSink:
+    """按文件扩展名选择输出格式（.db/.sqlite/.sqlite3 为 SQLite，其余为 JSON Lines）。"""
+    if path.suffix.lower() in (".db", ".sqlite", ".sqlite3"):
+        return SqliteSink(path)
+    return JsonLinesSink(path)
+
+
+class FleetPoller:
+    """多账号轮询器。
+
+    所有请求共用一个带连接池的 aiohttp 会话并保持连接；
+    token 刷新与重新认证逻辑与集成的数据协调器一致（由凭证管理器执行），
+    包括每轮开始前的主动刷新与请求失败后的被动恢复。
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any],
+        sink: JsonLinesSink | SqliteSink,
+        clock: Clock = system_clock,
+    ) -> None:
+        """初始化轮询器。
+
+        Args:
+            config: 配置
+            sink: 快照输出
+            clock: 时钟（用于快照时间戳、数据推算与凭证有效期）
+        """
+        self._config = config
+        self._sink = sink
+        self._clock = clock
+        self._concurrency = int(config.get("concurrency", DEFAULT_CONCURRENCY))
+        self._interval = float(config.get("interval", DEFAULT_INTERVAL))
+        self._parse_workers = int(config.get("parse_workers", 0))
+        self._accounts: list[_Account] = []
+        # 输出是同步写入，在线程中串行执行
+        self._write_lock = asyncio.Lock()
+
+    async def async_run(self, once: bool = False) -> None:
+        """登录全部账号并开始轮询。
+
+        Args:
+            once: 只采集一轮
+        """
+        connector = aiohttp.TCPConnector(limit=self._concurrency, keepalive_timeout=60)
+        executor = (
+            ProcessPoolExecutor(self._parse_workers) if self._parse_workers > 0 else None
+        )
+        try:
+            async with aiohttp.ClientSession(connector=connector) as session:
+                auth = SklandAuth(session)
+                lifetime = self._config.get("token_lifetime")
+                credentials = CredentialManager(
+                    lambda: auth,
+                    token_lifetime=float(lifetime) if lifetime else None,
+                    clock=self._clock,
+                )
+                await self._async_login(session, auth, credentials)
+                _LOGGER.info("共 %d 个角色待采集", len(self._accounts))
+
+                semaphore = asyncio.Semaphore(self._concurrency)
+                while True:
+                    started = time.monotonic()
+                    # 与集成一致：在 token 过期前主动刷新（每个原始 token 至多一次），
+                    # 使本轮请求不必先失败再恢复
+                    await credentials.async_refresh_due()
+                    results = await asyncio.gather(
+                        *(
+                            self._async_poll(account, credentials, semaphore, executor)
+                            for account in self._accounts
+                        ),
+                        return_exceptions=True,
+                    )
+                    for account, result in zip(self._accounts, results):
+                        if isinstance(result, Exception):
+                            _LOGGER.error(
+                                "采集发生未预期的错误 [%s]: %r", account.uid, result
+                            )
+                    _LOGGER.info(
+                        "本轮采集完成: %d / %d",
+                        sum(result is True for result in results),
+                        len(results),
+                    )
+                    if once:
+                        return
+                    await asyncio.sleep(
+                        max(0.0, self._interval - (time.monotonic() - started))
+                    )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    async def _async_login(
+        self,
+        session: aiohttp.ClientSession,
+        auth: SklandAuth,
+        credentials: CredentialManager,
+    ) -> None:
+        """认证全部 token 并确定要采集的角色。"""
+        for index, account in enumerate(self._config.get("accounts", [])):
+            token = account["token"]
+            try:
+                credential = await auth.authenticate(token)
+            except AuthError as e:
+                _LOGGER.error("第 %d 个账号认证失败，已跳过: %s", index + 1, e)
+                continue
+
+            client = SklandClient(
+                credential, session, clock=self._clock, keep_alive=True
+            )
+            credentials.register(token, client)
+
+            uids = account.get("uids")
+            if not uids:
+                try:
+                    bindings = await credentials.async_call(
+                        token, client, client.get_binding
+                    )
+                except RequestError as e:
+                    _LOGGER.error("第 %d 个账号获取绑定角色失败，已跳过: %s", index + 1, e)
+                    continue
+                uids = [binding.uid for binding in bindings]
+
+            self._accounts.extend(_Account(token, client, str(uid)) for uid in uids)
+
+    async def _async_poll(
+        self,
+        account: _Account,
+        credentials: CredentialManager,
+        semaphore: asyncio.Semaphore,
+        executor: Executor | None,
+    ) -> bool:
+        """采集单个角色。
+
+        单个角色的请求、解析或写入失败只记录日志，不影响其他角色与后续轮次。
+
+        Returns:
+            是否成功
+        """
+        client = account.client
+        try:
+            async with semaphore:
+                player_data = await credentials.async_call(
+                    account.token, client, lambda: client.get_player_data(account.uid)
+                )
+        except RequestError as e:
+            _LOGGER.warning("采集失败 [%s]: %s", account.uid, e)
+            return False
+
+        # 与集成中客户端解析玩家数据时相同的时间基准
+        fetched_at = client.clock()
+        try:
+            if executor is not None:
+                player = await asyncio.get_running_loop().run_in_executor(
+                    executor, parse_player_info, player_data, fetched_at
+                )
+            else:
+                player = parse_player_info(player_data, fetched_at)
+        except Exception as e:
+            _LOGGER.warning("解析玩家数据失败 [%s]: %s", account.uid, e)
+            return False
+
+        try:
+            async with self._write_lock:
+                await asyncio.to_thread(
+                    self._sink.write, account.uid, fetched_at, player
+                )
+        except (OSError, sqlite3.Error) as e:
+            _LOGGER.error("写入快照失败 [%s]: %s", account.uid, e)
+            return False
+        return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    """命令行入口。"""
+    parser = argparse.ArgumentParser(description="森空岛批量采集")
+    parser.add_argument("config", type=Path, help="配置文件（JSON）")
+    parser.add_argument("--once", action="store_true", help="只采集一轮后退出")
+    parser.add_argument("--output", type=Path, help="输出文件（覆盖配置文件中的 output）")
+    parser.add_argument("--log-level", default="INFO", help="日志级别")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    config = json.loads(args.config.read_text(encoding="utf-8"))
+    sink = open_sink(args.output or Path(config.get("output", DEFAULT_OUTPUT)))
+    try:
+        asyncio.run(FleetPoller(config, sink).async_run(once=args.once))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
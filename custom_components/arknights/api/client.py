@@ -9,12 +9,13 @@ import hmac
 import json
 import hashlib
 import logging
-from datetime import datetime
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 
 import aiohttp
 
-from ..const import SKLAND_BASE_URL, USER_AGENT
+from .const import SKLAND_BASE_URL, USER_AGENT
+from .clock import Clock, system_clock
 from .models import (
     Credential,
     PlayerStatus,
@@ -30,6 +31,18 @@ from .models import (
 
 _LOGGER = logging.getLogger(__name__)
 
+CLOCK_SKEW_ALPHA = 0.2
+"""时钟偏差估计的平滑系数（指数加权移动平均）"""
+
+CLOCK_SKEW_RESET = 30.0
+"""单次观测与估计值相差超过该秒数时视为本地时钟跳变，直接采用新观测"""
+
+CLOCK_SKEW_RETRY = 5.0
+"""请求失败且偏差估计变化超过该秒数时，按新的偏差立即重试一次"""
+
+ALREADY_SIGNED_MESSAGES = ("重复签到", "已签到")
+"""表示当天已签到的错误消息片段（服务端返回“请勿重复签到！”）"""
+
 
 class RequestError(Exception):
     """请求错误。"""
@@ -46,20 +59,33 @@ class UnauthorizedError(RequestError):
 class SklandClient:
     """森空岛 API 客户端。"""
 
-    def __init__(self, credential: Credential, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        credential: Credential,
+        session: aiohttp.ClientSession,
+        clock: Clock = system_clock,
+        keep_alive: bool = False,
+    ) -> None:
         """初始化客户端。
 
         Args:
             credential: 森空岛凭证
             session: aiohttp 会话
+            clock: 时钟（用于签名时间戳与数据推算）
+            keep_alive: 是否复用连接（批量采集时开启，配合会话的连接池）
         """
         self._credential = credential
         self._session = session
+        self._clock = clock
+        # 服务器时间减本地时间的估计值（秒），用于修正签名时间戳
+        self._clock_offset: float | None = None
+        self.clock_samples = 0
         self._headers = {
             "User-Agent": USER_AGENT,
             "Accept-Encoding": "gzip",
-            "Connection": "close",
         }
+        if not keep_alive:
+            self._headers["Connection"] = "close"
         self._header_for_sign = {
             "platform": "",
             "timestamp": "",
@@ -76,11 +102,62 @@ class SklandClient:
         """更新凭证。"""
         self._credential = credential
 
+    @property
+    def clock(self) -> Clock:
+        """客户端使用的时钟（玩家数据的推算基准）。"""
+        return self._clock
+
+    @property
+    def clock_offset(self) -> float:
+        """服务器时钟相对本地时钟的估计偏差（秒），尚无观测时为 0。"""
+        return self._clock_offset or 0.0
+
+    def _observe_server_time(
+        self,
+        data: dict,
+        date_header: str | None,
+        sent_at: float,
+        received_at: float,
+    ) -> None:
+        """根据响应中的服务器时间更新时钟偏差估计。
+
+        优先使用响应体中的 timestamp 字段，其次使用 Date 响应头；
+        以请求发出与收到响应的中点作为对应的本地时间。
+
+        Args:
+            data: 响应数据
+            date_header: Date 响应头
+            sent_at: 请求发出时的本地时间戳
+            received_at: 收到响应时的本地时间戳
+        """
+        server_time: float | None = None
+        try:
+            if data.get("timestamp"):
+                server_time = float(data["timestamp"])
+            elif date_header:
+                # Date 头精确到秒（向下取整），取该秒的中点
+                server_time = parsedate_to_datetime(date_header).timestamp() + 0.5
+        except (TypeError, ValueError):
+            return
+        if server_time is None:
+            return
+
+        sample = server_time - (sent_at + received_at) / 2
+        if (
+            self._clock_offset is None
+            or abs(sample - self._clock_offset) > CLOCK_SKEW_RESET
+        ):
+            self._clock_offset = sample
+        else:
+            self._clock_offset += CLOCK_SKEW_ALPHA * (sample - self._clock_offset)
+        self.clock_samples += 1
+
     def _get_sign_header(
         self,
         url: str,
         method: str,
-        body: dict | None = None,
+        body: dict | None,
+        now: float,
     ) -> dict:
         """生成带签名的请求头。
 
@@ -94,11 +171,12 @@ class SklandClient:
             url: 请求 URL
             method: 请求方法（get/post）
             body: POST 请求体
+            now: 服务器当前 Unix 时间戳（秒，已修正时钟偏差）
 
         Returns:
             带签名的请求头字典
         """
-        timestamp = int(datetime.now().timestamp()) - 1
+        timestamp = int(now) - 1
         header_ca = {**self._header_for_sign, "timestamp": str(timestamp)}
 
         parsed_url = urlparse(url)
@@ -132,13 +210,19 @@ class SklandClient:
         method: str,
         url: str,
         body: dict | None = None,
+        retry_on_skew: bool = True,
     ) -> dict:
         """发送带签名的请求。
 
+        签名时间戳按估计的服务器时钟偏差修正；若请求失败且本次响应
+        使偏差估计明显变化（例如首次请求时本地时钟已漂移），
+        按新的偏差立即重试一次，而不是进入认证恢复流程。
+
         Args:
             method: 请求方法
             url: 请求 URL
             body: 请求体
+            retry_on_skew: 是否允许因时钟偏差变化重试
 
         Returns:
             响应数据
@@ -147,7 +231,9 @@ class SklandClient:
             UnauthorizedError: Token 过期
             RequestError: 请求失败
         """
-        headers = self._get_sign_header(url, method, body)
+        offset = self.clock_offset
+        sent_at = self._clock()
+        headers = self._get_sign_header(url, method, body, sent_at + offset)
 
         try:
             if method.lower() == "post":
@@ -161,6 +247,7 @@ class SklandClient:
                     timeout=aiohttp.ClientTimeout(total=15.0),
                 ) as response:
                     data = await response.json()
+                    date_header = response.headers.get("Date")
             else:
                 async with self._session.get(
                     url, 
@@ -168,9 +255,21 @@ class SklandClient:
                     timeout=aiohttp.ClientTimeout(total=15.0)
                 ) as response:
                     data = await response.json()
+                    date_header = response.headers.get("Date")
 
+            self._observe_server_time(data, date_header, sent_at, self._clock())
             code = data.get("code", 0)
 
+            if (
+                code != 0
+                and retry_on_skew
+                and abs(self.clock_offset - offset) > CLOCK_SKEW_RETRY
+            ):
+                _LOGGER.warning(
+                    "检测到本地时钟偏差 %.1f 秒，按修正后的时间戳重试", self.clock_offset
+                )
+                return await self._request(method, url, body, retry_on_skew=False)
+
             if code == 10000:
                 raise UnauthorizedError(data.get("message", "认证过期"))
             elif code == 10002:
@@ -220,122 +319,30 @@ class SklandClient:
 
         return characters
 
-    async def get_player_info(self, uid: str) -> PlayerStatus:
-        """获取玩家信息。
+    async def get_player_data(self, uid: str) -> dict:
+        """获取原始玩家数据（未解析）。
 
         Args:
             uid: 角色 UID
 
         Returns:
-            玩家状态信息
+            API 返回的玩家数据
         """
         url = f"{SKLAND_BASE_URL}/game/player/info?uid={uid}"
         data = await self._request("get", url)
+        return data["data"]
 
-        player_data = data["data"]
-        status = player_data["status"]
-        ap = status["ap"]
-        secretary = status.get("secretary", {})
-        avatar = status.get("avatar", {})
-        
-        # 优先使用 API 返回的 charCnt，如果为 0 则用 chars 数组长度
-        # 注意：chars 数组包含阿米娅的升变形态（char_1001_amiya2），
-        # 但游戏/森空岛只计算为1人，所以需要排除
-        chars = player_data.get("chars", [])
-        char_count = status.get("charCnt", 0)
-        if char_count == 0:
-            # 统计时排除阿米娅升变形态
-            char_count = sum(1 for c in chars if not c.get("charId", "").startswith("char_1001_amiya"))
-        
-        # 解析基建数据
-        building_info = self._parse_building_data(player_data)
-
-        # 解析蚀刻章
-        medal = player_data.get("medal", {})
-        medal_count = medal.get("total", 0)
-
-        # 解析剿灭
-        campaign_data = player_data.get("campaign", {})
-        campaign_info = None
-        if campaign_data:
-            reward = campaign_data.get("reward", {})
-            campaign_info = CampaignInfo(
-                current=reward.get("current", 0),
-                total=reward.get("total", 1800),
-            )
-
-        # 解析日/周常任务
-        routine_data = player_data.get("routine", {})
-        routine_info = None
-        if routine_data:
-            daily = routine_data.get("daily", {})
-            weekly = routine_data.get("weekly", {})
-            routine_info = RoutineInfo(
-                daily_current=daily.get("current", 0),
-                daily_total=daily.get("total", 0),
-                weekly_current=weekly.get("current", 0),
-                weekly_total=weekly.get("total", 0),
-            )
+    async def get_player_info(self, uid: str) -> PlayerStatus:
+        """获取玩家信息。
 
-        # 解析保全派驻
-        tower_data = player_data.get("tower", {})
-        tower_info = None
-        if tower_data:
-            reward = tower_data.get("reward", {})
-            higher = reward.get("higherItem", {})
-            lower = reward.get("lowerItem", {})
-            tower_info = TowerInfo(
-                higher_current=higher.get("current", 0),
-                higher_total=higher.get("total", 0),
-                lower_current=lower.get("current", 0),
-                lower_total=lower.get("total", 0),
-                term_ts=reward.get("termTs", 0),
-            )
+        Args:
+            uid: 角色 UID
 
-        # 解析助战干员
-        assist_chars_data = player_data.get("assistChars", [])
-        assist_chars = []
-        for ac in assist_chars_data:
-            char_info = ac.get("charInfo", {}) if ac else {}
-            skill_info = ac.get("currentSkill", {}) if ac else {}
-            assist_chars.append(AssistCharInfo(
-                char_id=char_info.get("charId", ""),
-                skin_id=char_info.get("skinId", ""),
-                level=char_info.get("level", 0),
-                evolve_phase=char_info.get("evolvePhase", 0),
-                potential_rank=char_info.get("potentialRank", 0),
-                skill_id=skill_info.get("skillId", ""),
-                skill_level=skill_info.get("level", 0),
-                specialize_level=skill_info.get("specializeLevel", 0),
-            ))
-
-        return PlayerStatus(
-            uid=status["uid"],
-            name=status["name"],
-            level=status["level"],
-            sanity=SanityInfo(
-                current=ap["current"],
-                max=ap["max"],
-                last_ap_add_time=ap.get("lastApAddTime", 0),
-                complete_recovery_time=ap.get("completeRecoveryTime", 0),
-            ),
-            register_ts=status.get("registerTs", 0),
-            last_online_ts=status.get("lastOnlineTs", 0),
-            secretary_id=secretary.get("charId", ""),
-            secretary_skin_id=secretary.get("skinId", ""),
-            avatar_url=avatar.get("url", ""),
-            resume=status.get("resume", ""),
-            main_stage_progress=status.get("mainStageProgress", ""),
-            char_count=char_count,
-            furniture_count=status.get("furnitureCnt", 0),
-            skin_count=status.get("skinCnt", 0),
-            medal_count=medal_count,
-            building=building_info,
-            campaign=campaign_info,
-            routine=routine_info,
-            tower=tower_info,
-            assist_chars=assist_chars,
-        )
+        Returns:
+            玩家状态信息
+        """
+        player_data = await self.get_player_data(uid)
+        return parse_player_info(player_data, self._clock())
 
     async def sign(self, uid: str, channel_master_id: str) -> SignResult:
         """执行签到。
@@ -366,10 +373,13 @@ class SklandClient:
                 awards=awards,
             )
 
+        except UnauthorizedError:
+            # 认证失效交由调用方恢复凭证后重试
+            raise
         except RequestError as e:
-            # 检查是否是"已签到"的情况
+            # 只把明确的"已签到"视为成功，其余错误（如签到活动异常）照常报告失败
             error_msg = str(e)
-            if "已经" in error_msg or "签到" in error_msg:
+            if any(fragment in error_msg for fragment in ALREADY_SIGNED_MESSAGES):
                 return SignResult(
                     success=True,
                     message="今日已签到",
@@ -381,143 +391,265 @@ class SklandClient:
                 awards=[],
             )
 
-    def _parse_building_data(self, player_data: dict) -> BuildingInfo:
-        """解析基建数据。
 
-        Args:
-            player_data: API 返回的玩家数据
+def parse_player_info(player_data: dict, now: float) -> PlayerStatus:
+    """解析玩家数据。
+
+    纯函数，不依赖客户端状态，可在进程池中执行。
+
+    Args:
+        player_data: API 返回的玩家数据
+        now: 获取数据时的 Unix 时间戳（秒）
+
+    Returns:
+        玩家状态信息
+    """
+    status = player_data["status"]
+    ap = status["ap"]
+    secretary = status.get("secretary", {})
+    avatar = status.get("avatar", {})
+
+    # 优先使用 API 返回的 charCnt，如果为 0 则用 chars 数组长度
+    # 注意：chars 数组包含阿米娅的升变形态（char_1001_amiya2），
+    # 但游戏/森空岛只计算为1人，所以需要排除
+    chars = player_data.get("chars", [])
+    char_count = status.get("charCnt", 0)
+    if char_count == 0:
+        # 统计时排除阿米娅升变形态
+        char_count = sum(1 for c in chars if not c.get("charId", "").startswith("char_1001_amiya"))
+
+    # 解析基建数据
+    building_info = _parse_building_data(player_data, now)
+
+    # 解析蚀刻章
+    medal = player_data.get("medal", {})
+    medal_count = medal.get("total", 0)
+
+    # 解析剿灭
+    campaign_data = player_data.get("campaign", {})
+    campaign_info = None
+    if campaign_data:
+        reward = campaign_data.get("reward", {})
+        campaign_info = CampaignInfo(
+            current=reward.get("current", 0),
+            total=reward.get("total", 1800),
+        )
 
-        Returns:
-            基建信息
-        """
-        building = player_data.get("building", {})
-        if not building:
-            return BuildingInfo()
-
-        # 解析贸易站
-        trading_stock = 0
-        trading_stock_limit = 0
-        tradings = building.get("tradings", [])
-        current_time = datetime.now().timestamp()
-        for trading in tradings:
-            # 库存上限
-            trading_stock_limit += trading.get("stockLimit", 0)
-            # 已有库存
-            stock = trading.get("stock", [])
-            trading_stock += len(stock)
-            # 如果订单正在生产中且已完成
-            complete_work_time = trading.get("completeWorkTime", 0)
-            if complete_work_time > 0 and current_time >= complete_work_time:
-                trading_stock += 1
-
-        # 解析制造站
-        manufacture_complete = 0
-        manufacture_capacity = 0
-        manufactures = building.get("manufactures", [])
-        for manu in manufactures:
-            # 已完成数量
-            manufacture_complete += manu.get("complete", 0)
-            # 容量（简化计算，使用容量/重量）
-            capacity = manu.get("capacity", 0)
-            weight = manu.get("weight", 1)
-            if weight > 0:
-                manufacture_capacity += capacity // weight
-
-        # 解析无人机
-        labor = building.get("labor", {})
-        drone_current = labor.get("value", 0)
-        drone_max = labor.get("maxValue", 0)
-        # 计算实时无人机数量
-        if drone_current < drone_max:
-            last_update = labor.get("lastUpdateTime", 0)
-            remain_secs = labor.get("remainSecs", 0)
-            if last_update > 0 and remain_secs > 0:
-                elapsed = current_time - last_update
-                recovery_rate = remain_secs / max(drone_max - drone_current, 1)
-                if recovery_rate > 0:
-                    additional = int(elapsed / recovery_rate)
-                    drone_current = min(drone_current + additional, drone_max)
-
-        # 解析训练室
-        training = building.get("training", {})
-        training_state = "空闲"
-        training_remaining_secs = 0
-        trainee_char_id = ""
-        if training:
-            trainee = training.get("trainee", {})
-            if trainee and trainee.get("charId"):
-                trainee_char_id = trainee.get("charId", "")
-                target_skill = trainee.get("targetSkill", -1)
-                if target_skill >= 0:
-                    skill_names = ["1技能", "2技能", "3技能"]
-                    skill_name = skill_names[target_skill] if target_skill < 3 else f"{target_skill + 1}技能"
-                    training_state = f"训练中 ({skill_name})"
-                    training_remaining_secs = max(0, training.get("remainSecs", 0))
-
-        # 解析公招
-        hire = building.get("hire", {})
-        hire_refresh_count = hire.get("refreshCount", 0) if hire else 0
-        hire_complete_time = hire.get("completeWorkTime", 0) if hire else 0
-
-        # 解析公招槽位
-        recruit = player_data.get("recruit", [])
-        recruit_finished = 0
-        recruit_total = len(recruit)
-        for slot in recruit:
-            # state == 1 表示已完成
-            if slot.get("state", 0) == 1:
-                recruit_finished += 1
-
-        # 解析宿舍/休息进度
-        dormitories = building.get("dormitories", [])
-        resting_count = 0
-        rested_count = 0
-        for dorm in dormitories:
-            dorm_chars = dorm.get("chars", [])
-            dorm_level = dorm.get("level", 1)
-            dorm_comfort = dorm.get("comfort", 0)
-            for char in dorm_chars:
-                resting_count += 1
-                # 计算是否休息完成（ap >= 8640000 表示满体力）
-                char_ap = char.get("ap", 0)
-                last_ap_add_time = char.get("lastApAddTime", 0)
-                # 简化计算：ap 恢复速率约 1.5 + level*0.1 + comfort*0.0004
-                if last_ap_add_time > 0:
-                    ap_gain_rate = 1.5 + dorm_level * 0.1 + 0.0004 * dorm_comfort
-                    time_elapsed = current_time - last_ap_add_time
-                    ap_now = min(char_ap + time_elapsed * ap_gain_rate, 8640000)
-                    if ap_now >= 8640000:
-                        rested_count += 1
-
-        # 解析线索
-        meeting = building.get("meeting", {})
-        clue = meeting.get("clue", {}) if meeting else {}
-        clue_own = clue.get("own", 0)
-        clue_received = clue.get("received", 0)
-        clue_board = clue.get("board", [])
-
-        # 解析疲劳干员
-        tired_chars = building.get("tiredChars", [])
-        tired_count = len(tired_chars)
-
-        return BuildingInfo(
-            trading_stock=trading_stock,
-            trading_stock_limit=trading_stock_limit,
-            manufacture_complete=manufacture_complete,
-            manufacture_capacity=manufacture_capacity,
-            drone_current=drone_current,
-            drone_max=drone_max,
-            training_state=training_state,
-            training_remaining_secs=training_remaining_secs,
-            trainee_char_id=trainee_char_id,
-            hire_refresh_count=hire_refresh_count,
-            hire_complete_time=hire_complete_time,
-            recruit_finished=recruit_finished,
-            recruit_total=recruit_total,
-            resting_count=resting_count,
-            rested_count=rested_count,
-            clue_own=clue_own,
-            clue_received=clue_received,
-            clue_board=clue_board,
-            tired_count=tired_count,
+    # 解析日/周常任务
+    routine_data = player_data.get("routine", {})
+    routine_info = None
+    if routine_data:
+        daily = routine_data.get("daily", {})
+        weekly = routine_data.get("weekly", {})
+        routine_info = RoutineInfo(
+            daily_current=daily.get("current", 0),
+            daily_total=daily.get("total", 0),
+            weekly_current=weekly.get("current", 0),
+            weekly_total=weekly.get("total", 0),
         )
+
+    # 解析保全派驻
+    tower_data = player_data.get("tower", {})
+    tower_info = None
+    if tower_data:
+        reward = tower_data.get("reward", {})
+        higher = reward.get("higherItem", {})
+        lower = reward.get("lowerItem", {})
+        tower_info = TowerInfo(
+            higher_current=higher.get("current", 0),
+            higher_total=higher.get("total", 0),
+            lower_current=lower.get("current", 0),
+            lower_total=lower.get("total", 0),
+            term_ts=reward.get("termTs", 0),
+        )
+
+    # 解析助战干员
+    assist_chars_data = player_data.get("assistChars", [])
+    assist_chars = []
+    for ac in assist_chars_data:
+        char_info = ac.get("charInfo", {}) if ac else {}
+        skill_info = ac.get("currentSkill", {}) if ac else {}
+        assist_chars.append(AssistCharInfo(
+            char_id=char_info.get("charId", ""),
+            skin_id=char_info.get("skinId", ""),
+            level=char_info.get("level", 0),
+            evolve_phase=char_info.get("evolvePhase", 0),
+            potential_rank=char_info.get("potentialRank", 0),
+            skill_id=skill_info.get("skillId", ""),
+            skill_level=skill_info.get("level", 0),
+            specialize_level=skill_info.get("specializeLevel", 0),
+        ))
+
+    return PlayerStatus(
+        uid=status["uid"],
+        name=status["name"],
+        level=status["level"],
+        sanity=SanityInfo(
+            current=ap["current"],
+            max=ap["max"],
+            last_ap_add_time=ap.get("lastApAddTime", 0),
+            complete_recovery_time=ap.get("completeRecoveryTime", 0),
+        ),
+        register_ts=status.get("registerTs", 0),
+        last_online_ts=status.get("lastOnlineTs", 0),
+        secretary_id=secretary.get("charId", ""),
+        secretary_skin_id=secretary.get("skinId", ""),
+        avatar_url=avatar.get("url", ""),
+        resume=status.get("resume", ""),
+        main_stage_progress=status.get("mainStageProgress", ""),
+        char_count=char_count,
+        furniture_count=status.get("furnitureCnt", 0),
+        skin_count=status.get("skinCnt", 0),
+        medal_count=medal_count,
+        building=building_info,
+        campaign=campaign_info,
+        routine=routine_info,
+        tower=tower_info,
+        assist_chars=assist_chars,
+    )
+
+
+def _parse_building_data(player_data: dict, now: float) -> BuildingInfo:
+    """解析基建数据。
+
+    Args:
+        player_data: API 返回的玩家数据
+        now: 当前 Unix 时间戳（秒）
+
+    Returns:
+        基建信息
+    """
+    building = player_data.get("building", {})
+    if not building:
+        return BuildingInfo()
+
+    # 解析贸易站
+    trading_stock = 0
+    trading_stock_limit = 0
+    tradings = building.get("tradings", [])
+    current_time = now
+    for trading in tradings:
+        # 库存上限
+        trading_stock_limit += trading.get("stockLimit", 0)
+        # 已有库存
+        stock = trading.get("stock", [])
+        trading_stock += len(stock)
+        # 如果订单正在生产中且已完成
+        complete_work_time = trading.get("completeWorkTime", 0)
+        if complete_work_time > 0 and current_time >= complete_work_time:
+            trading_stock += 1
+
+    # 解析制造站
+    manufacture_complete = 0
+    manufacture_capacity = 0
+    manufactures = building.get("manufactures", [])
+    for manu in manufactures:
+        # 已完成数量
+        manufacture_complete += manu.get("complete", 0)
+        # 容量（简化计算，使用容量/重量）
+        capacity = manu.get("capacity", 0)
+        weight = manu.get("weight", 1)
+        if weight > 0:
+            manufacture_capacity += capacity // weight
+
+    # 解析无人机
+    labor = building.get("labor", {})
+    drone_base = labor.get("value", 0)
+    drone_max = labor.get("maxValue", 0)
+    drone_last_update = labor.get("lastUpdateTime", 0)
+    drone_recovery_secs = 0.0
+    # 计算每架无人机的恢复耗时，用于推算实时无人机数量
+    if drone_base < drone_max:
+        remain_secs = labor.get("remainSecs", 0)
+        if drone_last_update > 0 and remain_secs > 0:
+            drone_recovery_secs = remain_secs / max(drone_max - drone_base, 1)
+
+    # 解析训练室
+    training = building.get("training", {})
+    training_state = "空闲"
+    training_remaining_secs = 0
+    trainee_char_id = ""
+    if training:
+        trainee = training.get("trainee", {})
+        if trainee and trainee.get("charId"):
+            trainee_char_id = trainee.get("charId", "")
+            target_skill = trainee.get("targetSkill", -1)
+            if target_skill >= 0:
+                skill_names = ["1技能", "2技能", "3技能"]
+                skill_name = skill_names[target_skill] if target_skill < 3 else f"{target_skill + 1}技能"
+                training_state = f"训练中 ({skill_name})"
+                training_remaining_secs = max(0, training.get("remainSecs", 0))
+
+    # 解析公招
+    hire = building.get("hire", {})
+    hire_refresh_count = hire.get("refreshCount", 0) if hire else 0
+    hire_complete_time = hire.get("completeWorkTime", 0) if hire else 0
+
+    # 解析公招槽位
+    recruit = player_data.get("recruit", [])
+    recruit_finished = 0
+    recruit_total = len(recruit)
+    for slot in recruit:
+        # state == 1 表示已完成
+        if slot.get("state", 0) == 1:
+            recruit_finished += 1
+
+    # 解析宿舍/休息进度
+    dormitories = building.get("dormitories", [])
+    resting_count = 0
+    rested_count = 0
+    for dorm in dormitories:
+        dorm_chars = dorm.get("chars", [])
+        dorm_level = dorm.get("level", 1)
+        dorm_comfort = dorm.get("comfort", 0)
+        for char in dorm_chars:
+            resting_count += 1
+            # 计算是否休息完成（ap >= 8640000 表示满体力）
+            char_ap = char.get("ap", 0)
+            last_ap_add_time = char.get("lastApAddTime", 0)
+            # 简化计算：ap 恢复速率约 1.5 + level*0.1 + comfort*0.0004
+            if last_ap_add_time > 0:
+                ap_gain_rate = 1.5 + dorm_level * 0.1 + 0.0004 * dorm_comfort
+                time_elapsed = current_time - last_ap_add_time
+                ap_now = min(char_ap + time_elapsed * ap_gain_rate, 8640000)
+                if ap_now >= 8640000:
+                    rested_count += 1
+
+    # 解析线索
+    meeting = building.get("meeting", {})
+    clue = meeting.get("clue", {}) if meeting else {}
+    clue_own = clue.get("own", 0)
+    clue_received = clue.get("received", 0)
+    clue_board = clue.get("board", [])
+
+    # 解析疲劳干员
+    tired_chars = building.get("tiredChars", [])
+    tired_count = len(tired_chars)
+
+    building_info = BuildingInfo(
+        trading_stock=trading_stock,
+        trading_stock_limit=trading_stock_limit,
+        manufacture_complete=manufacture_complete,
+        manufacture_capacity=manufacture_capacity,
+        drone_current=drone_base,
+        drone_max=drone_max,
+        drone_base=drone_base,
+        drone_last_update_time=drone_last_update,
+        drone_recovery_secs=drone_recovery_secs,
+        training_state=training_state,
+        training_remaining_secs=training_remaining_secs,
+        trainee_char_id=trainee_char_id,
+        hire_refresh_count=hire_refresh_count,
+        hire_complete_time=hire_complete_time,
+        recruit_finished=recruit_finished,
+        recruit_total=recruit_total,
+        resting_count=resting_count,
+        rested_count=rested_count,
+        clue_own=clue_own,
+        clue_received=clue_received,
+        clue_board=clue_board,
+        tired_count=tired_count,
+        snapshot_ts=current_time,
+    )
+    building_info.drone_current = building_info.drone_at(current_time)
+    return building_info
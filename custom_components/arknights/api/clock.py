@@ -0,0 +1,78 @@
+"""时钟抽象。
+
+模型、解析器与签名均通过注入的时钟获取当前时间，
+便于在一次计算中使用同一时间快照，也便于模拟时间流逝。
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+Clock = Callable[[], float]
+"""时钟：返回当前 Unix 时间戳（秒）"""
+
+GAME_TIMEZONE = timezone(timedelta(hours=8))
+"""游戏服务器时区（UTC+8）"""
+
+GAME_DAY_RESET_HOUR = 4
+"""每日重置时刻（服务器时间 04:00）"""
+
+
+def system_clock() -> float:
+    """系统时钟。"""
+    return time.time()
+
+
+class ManualClock:
+    """手动推进的时钟（用于模拟与回放）。"""
+
+    def __init__(self, start: float | None = None) -> None:
+        """初始化时钟。
+
+        Args:
+            start: 起始时间戳，默认为当前系统时间
+        """
+        self.now = time.time() if start is None else start
+
+    def __call__(self) -> float:
+        """返回当前模拟时间戳。"""
+        return self.now
+
+    def advance(self, seconds: float) -> float:
+        """推进时钟。
+
+        Args:
+            seconds: 推进的秒数
+
+        Returns:
+            推进后的时间戳
+        """
+        self.now += seconds
+        return self.now
+
+
+def game_day(timestamp: float) -> str:
+    """获取时间戳所在的游戏日。
+
+    游戏日以服务器时间 04:00 为界。
+
+    Args:
+        timestamp: Unix 时间戳（秒）
+
+    Returns:
+        游戏日日期（YYYY-MM-DD）
+    """
+    shifted = timestamp - GAME_DAY_RESET_HOUR * 3600
+    return datetime.fromtimestamp(shifted, GAME_TIMEZONE).date().isoformat()
+
+
+def game_day_start(timestamp: float) -> float:
+    """获取时间戳所在游戏日的起始时间戳。
+
+    Args:
+        timestamp: Unix 时间戳（秒）
+    """
+    day = datetime.fromisoformat(game_day(timestamp)).replace(
+        hour=GAME_DAY_RESET_HOUR, tzinfo=GAME_TIMEZONE
+    )
+    return day.timestamp()
@@ -0,0 +1,15 @@
+"""森空岛 API 常量。
+
+api 包可独立于 Home Assistant 使用，所需常量集中定义于此，
+集成的 const 模块从这里重新导出。
+"""
+
+# API 端点
+SKLAND_BASE_URL = "https://zonai.skland.com/api/v1"
+HYPERGRYPH_BASE_URL = "https://as.hypergryph.com"
+
+# 应用代码
+SKLAND_APP_CODE = "4ca99fa6b56cc2ba"
+
+# User-Agent
+USER_AGENT = "Skland/1.32.1 (com.hypergryph.skland; build:103201004; Android 33; ) Okhttp/4.11.0"
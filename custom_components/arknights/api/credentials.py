@@ -0,0 +1,397 @@
+"""森空岛凭证管理。
+
+同一个原始 token 认证出的凭证会被多个角色（多个客户端）共用。
+凭证管理器按原始 token 分组，保证同一组内的 token 刷新与重新认证
+同一时刻只执行一次，并发的调用方等待同一个操作的结果。
+
+token 的有效期可以显式配置，也可以从被动刷新（请求失败后刷新）时
+观察到的 token 存活时长中学习（仅限获取时间已知的凭证）；已知有效期后，
+调用方定期调用 async_refresh_due 即可在 token 过期前主动刷新，
+使正常请求几乎不会遇到认证失败。
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TypeVar
+
+from .client import UnauthorizedError
+from .clock import Clock, system_clock
+from .models import Credential
+
+if TYPE_CHECKING:
+    from .auth import SklandAuth
+    from .client import SklandClient
+
+_T = TypeVar("_T")
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_TOKEN_LIFETIME = 60.0
+"""可学习的最短 token 有效期（秒），更短的观测值视为服务端主动失效"""
+
+DEFAULT_REFRESH_MARGIN = 0.8
+"""主动刷新时机：在有效期的该比例处刷新"""
+
+CredentialListener = Callable[[Credential], Awaitable[None]]
+"""凭证更新回调（用于持久化新凭证）"""
+
+
+@dataclass
+class _CredentialGroup:
+    """共用同一原始 token 的客户端组。"""
+
+    credential: Credential
+    """组内当前有效的凭证"""
+    clients: list["SklandClient"] = field(default_factory=list)
+    """使用该凭证的客户端"""
+    listeners: list[CredentialListener] = field(default_factory=list)
+    """凭证更新回调"""
+    tasks: dict[str, asyncio.Task] = field(default_factory=dict)
+    """进行中的刷新/认证操作"""
+    issued_at: float | None = None
+    """当前凭证的获取时间（登记的既有凭证获取时间未知，为 None）"""
+    learned_lifetime: float | None = None
+    """观察到的 token 最短存活时长（秒）"""
+    configured_lifetimes: dict["SklandClient", float] = field(default_factory=dict)
+    """登记时为各客户端配置的 token 有效期（秒）"""
+    proactive_failed: bool = False
+    """当前凭证的主动刷新是否已失败（失败后交由被动刷新处理）"""
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    """需要按凭证串行执行的请求所用的锁"""
+
+
+class CredentialManager:
+    """凭证管理器。
+
+    负责 token 刷新与使用原始 token 重新认证，按原始 token 单飞（single-flight）：
+    同一组内并发的恢复请求只会触发一次网络操作。
+    """
+
+    def __init__(
+        self,
+        auth_factory: Callable[[], "SklandAuth"],
+        token_lifetime: float | None = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        clock: Clock = system_clock,
+    ) -> None:
+        """初始化凭证管理器。
+
+        Args:
+            auth_factory: 获取认证客户端的函数（仅在需要刷新/认证时调用）
+            token_lifetime: 默认的 token 有效期（秒），为空则从被动刷新中学习
+            refresh_margin: 在有效期的该比例处主动刷新
+            clock: 时钟
+        """
+        self._auth_factory = auth_factory
+        self._token_lifetime = token_lifetime
+        self._refresh_margin = refresh_margin
+        self._clock = clock
+        self._groups: dict[str, _CredentialGroup] = {}
+        # 刷新统计（用于诊断）
+        self.reactive_refreshes = 0
+        self.proactive_refreshes = 0
+        self.reauthentications = 0
+
+    @property
+    def has_clients(self) -> bool:
+        """是否有已登记的客户端。"""
+        return bool(self._groups)
+
+    def register(
+        self,
+        original_token: str,
+        client: "SklandClient",
+        listener: CredentialListener | None = None,
+        token_lifetime: float | None = None,
+    ) -> Callable[[], None]:
+        """登记客户端。
+
+        Args:
+            original_token: 用户原始 token
+            client: 使用该凭证的客户端
+            listener: 凭证更新回调
+            token_lifetime: 该客户端配置的 token 有效期（秒），为空则使用默认值；
+                同一组内配置不同时取最短者
+
+        Returns:
+            注销该客户端的函数
+        """
+        group = self._groups.get(original_token)
+        if group is None:
+            group = self._groups[original_token] = _CredentialGroup(client.credential)
+        else:
+            # 组内已有更新的凭证时同步给新客户端
+            client.update_credential(group.credential)
+        group.clients.append(client)
+        if listener is not None:
+            group.listeners.append(listener)
+        if token_lifetime is not None:
+            group.configured_lifetimes[client] = token_lifetime
+
+        def _unregister() -> None:
+            group.clients.remove(client)
+            group.configured_lifetimes.pop(client, None)
+            if listener is not None:
+                group.listeners.remove(listener)
+            if not group.clients and self._groups.get(original_token) is group:
+                del self._groups[original_token]
+
+        return _unregister
+
+    def lock(self, original_token: str) -> asyncio.Lock:
+        """获取凭证级的锁，用于同一凭证下需要串行执行的请求（如签到）。
+
+        Args:
+            original_token: 用户原始 token
+        """
+        group = self._groups.get(original_token)
+        return group.lock if group is not None else asyncio.Lock()
+
+    async def async_call(
+        self,
+        original_token: str,
+        client: "SklandClient",
+        request: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        """执行 API 请求，认证失效时恢复凭证后重试。
+
+        认证恢复策略：
+        1. 首先尝试正常请求
+        2. 若 Token 过期，尝试 refresh_token
+        3. 若 refresh 失败或刷新后仍失败，使用原始 token 重新完整认证
+        4. 若仍失败，抛出 UnauthorizedError
+
+        Args:
+            original_token: 用户原始 token
+            client: 发起请求的客户端（请求发出前的凭证作为失败时的旧凭证）
+            request: 发起请求的函数
+
+        Raises:
+            UnauthorizedError: 认证彻底失败
+        """
+        # 旧凭证必须在请求发出前记录：请求进行期间其他调用方可能已完成刷新，
+        # 此时失败的请求使用的仍是旧凭证，不应再触发一次刷新
+        stale = client.credential
+        try:
+            return await request()
+        except UnauthorizedError as e:
+            _LOGGER.warning("Token 过期，开始恢复流程: %s", e)
+
+        # 第一步：尝试刷新 token
+        if await self.async_refresh_token(original_token, stale):
+            stale = client.credential
+            try:
+                return await request()
+            except UnauthorizedError:
+                _LOGGER.warning("刷新后仍然失败，尝试完整重新认证")
+
+        # 第二步：使用原始 token 重新完整认证
+        if not await self.async_reauthenticate(original_token, stale):
+            raise UnauthorizedError("认证已过期，原始 Token 可能已失效")
+        return await request()
+
+    async def async_refresh_token(self, original_token: str, stale: Credential) -> bool:
+        """刷新 token。
+
+        Args:
+            original_token: 用户原始 token
+            stale: 调用方失败时使用的凭证
+
+        Returns:
+            是否已获得新凭证
+        """
+        return await self._async_single_flight(
+            original_token, stale, "refresh", self._async_do_refresh
+        )
+
+    def next_refresh_at(self, original_token: str) -> float | None:
+        """获取主动刷新的计划时间。
+
+        Args:
+            original_token: 用户原始 token
+
+        Returns:
+            Unix 时间戳；有效期或凭证获取时间未知、该组不存在时为 None
+        """
+        group = self._groups.get(original_token)
+        if group is None or group.issued_at is None:
+            return None
+        lifetime = self._configured_lifetime(group) or group.learned_lifetime
+        if lifetime is None:
+            return None
+        return group.issued_at + lifetime * self._refresh_margin
+
+    async def async_refresh_due(self) -> None:
+        """主动刷新即将过期的 token。
+
+        应在轮询间隙定期调用。主动刷新失败不会升级为重新认证，
+        该凭证后续的失效交由被动恢复流程处理。
+        """
+        now = self._clock()
+        for original_token, group in list(self._groups.items()):
+            refresh_at = self.next_refresh_at(original_token)
+            if (
+                refresh_at is None
+                or now < refresh_at
+                or group.proactive_failed
+                or "refresh" in group.tasks
+            ):
+                continue
+            _LOGGER.debug("token 即将过期，主动刷新")
+            if not await self._async_single_flight(
+                original_token,
+                group.credential,
+                "refresh",
+                partial(self._async_do_refresh, proactive=True),
+            ):
+                group.proactive_failed = True
+
+    def stats(self, original_token: str | None = None) -> dict[str, Any]:
+        """获取刷新统计（用于诊断，不含凭证内容）。
+
+        Args:
+            original_token: 用户原始 token，给出时附带该组的凭证时间信息
+        """
+        stats: dict[str, Any] = {
+            "reactive_refreshes": self.reactive_refreshes,
+            "proactive_refreshes": self.proactive_refreshes,
+            "reauthentications": self.reauthentications,
+            "configured_lifetime": self._token_lifetime,
+        }
+        group = self._groups.get(original_token) if original_token else None
+        if group is not None:
+            stats["configured_lifetime"] = self._configured_lifetime(group)
+            stats["token_age"] = (
+                round(self._clock() - group.issued_at)
+                if group.issued_at is not None
+                else None
+            )
+            stats["learned_lifetime"] = group.learned_lifetime
+            stats["next_refresh_at"] = self.next_refresh_at(original_token)
+        return stats
+
+    async def async_reauthenticate(self, original_token: str, stale: Credential) -> bool:
+        """使用原始 token 重新完整认证。
+
+        Args:
+            original_token: 用户原始 token
+            stale: 调用方失败时使用的凭证
+
+        Returns:
+            是否已获得新凭证
+        """
+        return await self._async_single_flight(
+            original_token, stale, "reauth", self._async_do_reauthenticate
+        )
+
+    async def _async_single_flight(
+        self,
+        original_token: str,
+        stale: Credential,
+        operation: str,
+        func: Callable[[str, Credential], Awaitable[Credential | None]],
+    ) -> bool:
+        """对同一组同一操作只执行一次，其余调用方等待其结果。"""
+        group = self._groups.get(original_token)
+        if group is None:
+            return False
+
+        # 其他调用方已经完成了恢复，直接使用新凭证
+        if group.credential.token != stale.token:
+            return True
+
+        task = group.tasks.get(operation)
+        if task is None:
+            task = asyncio.ensure_future(func(original_token, group.credential))
+            group.tasks[operation] = task
+            task.add_done_callback(lambda _: group.tasks.pop(operation, None))
+
+        new_cred = await asyncio.shield(task)
+        return new_cred is not None
+
+    async def _async_do_refresh(
+        self, original_token: str, current: Credential, proactive: bool = False
+    ) -> Credential | None:
+        """执行 token 刷新。
+
+        被动刷新时以当前凭证的存活时长作为有效期的一次观测。
+        """
+        if proactive:
+            self.proactive_refreshes += 1
+        else:
+            self.reactive_refreshes += 1
+            self._learn_lifetime(original_token)
+
+        try:
+            new_token = await self._auth_factory().refresh_token(current.cred)
+        except Exception as e:
+            if proactive:
+                _LOGGER.debug("主动刷新 token 失败: %s", e)
+            else:
+                _LOGGER.warning("Token 刷新失败，将尝试重新认证: %s", e)
+            return None
+
+        new_cred = Credential(cred=current.cred, token=new_token, user_id=current.user_id)
+        await self._async_apply(original_token, new_cred)
+        _LOGGER.info("Token 刷新成功")
+        return new_cred
+
+    async def _async_do_reauthenticate(
+        self, original_token: str, current: Credential
+    ) -> Credential | None:
+        """执行完整重新认证。"""
+        from .auth import AuthError
+
+        self.reauthentications += 1
+        try:
+            _LOGGER.info("正在使用原始 token 重新认证...")
+            new_cred = await self._auth_factory().authenticate(original_token)
+        except AuthError as e:
+            _LOGGER.error("重新认证失败: %s", e)
+            return None
+
+        await self._async_apply(original_token, new_cred)
+        _LOGGER.info("重新认证成功")
+        return new_cred
+
+    async def _async_apply(self, original_token: str, new_cred: Credential) -> None:
+        """将新凭证应用到组内所有客户端并通知持久化。"""
+        group = self._groups.get(original_token)
+        if group is None:
+            return
+
+        group.credential = new_cred
+        group.issued_at = self._clock()
+        group.proactive_failed = False
+        for client in group.clients:
+            client.update_credential(new_cred)
+
+        for listener in list(group.listeners):
+            try:
+                await listener(new_cred)
+            except Exception as e:
+                _LOGGER.warning("凭证持久化失败（不影响运行）: %s", e)
+
+    def _configured_lifetime(self, group: _CredentialGroup) -> float | None:
+        """获取组的配置有效期（客户端配置的最短者，未配置时为默认值）。"""
+        if group.configured_lifetimes:
+            return min(group.configured_lifetimes.values())
+        return self._token_lifetime
+
+    def _learn_lifetime(self, original_token: str) -> None:
+        """记录当前凭证失效前的存活时长，取观测到的最小值。
+
+        只从由本管理器获取（获取时间已知）的凭证中学习；登记时已有的凭证
+        可能早在启动前就已获取，其存活时长会被低估。
+        """
+        group = self._groups.get(original_token)
+        if group is None or group.issued_at is None:
+            return
+        observed = self._clock() - group.issued_at
+        if observed < MIN_TOKEN_LIFETIME:
+            return
+        if group.learned_lifetime is None or observed < group.learned_lifetime:
+            group.learned_lifetime = observed
+            _LOGGER.debug("学习到 token 有效期: %.0f 秒", observed)
@@ -5,9 +5,10 @@ Copyright (c) 2025 FrostN0v0
 MIT License
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 import math
+from typing import Any
 
 
 @dataclass
@@ -38,15 +39,22 @@ class SanityInfo:
     @property
     def current_now(self) -> int:
         """计算当前实际理智值。"""
+        return self.current_at(datetime.now().timestamp())
+
+    def current_at(self, now: float) -> int:
+        """计算指定时刻的实际理智值。
+
+        Args:
+            now: Unix 时间戳（秒）
+        """
         if self.complete_recovery_time <= 0:
             return self.current
 
-        current_time = datetime.now().timestamp()
-        if current_time >= self.complete_recovery_time:
+        if now >= self.complete_recovery_time:
             return self.max
 
         # 每 6 分钟（360 秒）恢复 1 点
-        ap_now = self.max - math.ceil((self.complete_recovery_time - current_time) / 360)
+        ap_now = self.max - math.ceil((self.complete_recovery_time - now) / 360)
         return min(max(ap_now, 0), self.max)
 
     @property
@@ -59,9 +67,17 @@ class SanityInfo:
     @property
     def minutes_to_full(self) -> int:
         """距离理智满还需多少分钟。"""
+        return self.minutes_to_full_at(datetime.now().timestamp())
+
+    def minutes_to_full_at(self, now: float) -> int:
+        """计算指定时刻距离理智满还需多少分钟。
+
+        Args:
+            now: Unix 时间戳（秒）
+        """
         if self.complete_recovery_time <= 0:
             return 0
-        remaining = self.complete_recovery_time - datetime.now().timestamp()
+        remaining = self.complete_recovery_time - now
         return max(0, int(remaining / 60))
 
 
@@ -115,6 +131,32 @@ class PlayerStatus:
         """注册日期。"""
         return datetime.fromtimestamp(self.register_ts).strftime("%Y-%m-%d")
 
+    def as_dict(self) -> dict[str, Any]:
+        """转换为可 JSON 序列化的字典（用于持久化快照）。"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PlayerStatus":
+        """从 as_dict 生成的字典还原玩家状态。
+
+        Raises:
+            KeyError / TypeError: 快照格式不匹配
+        """
+        values = dict(data)
+        values["sanity"] = SanityInfo(**values["sanity"])
+        if values.get("building") is not None:
+            values["building"] = BuildingInfo(**values["building"])
+        if values.get("campaign") is not None:
+            values["campaign"] = CampaignInfo(**values["campaign"])
+        if values.get("routine") is not None:
+            values["routine"] = RoutineInfo(**values["routine"])
+        if values.get("tower") is not None:
+            values["tower"] = TowerInfo(**values["tower"])
+        values["assist_chars"] = [
+            AssistCharInfo(**ac) for ac in values.get("assist_chars", [])
+        ]
+        return cls(**values)
+
 
 @dataclass
 class CampaignInfo:
@@ -229,6 +271,12 @@ class BuildingInfo:
     """当前无人机数量"""
     drone_max: int = 0
     """最大无人机数量"""
+    drone_base: int = 0
+    """API 返回的无人机数量（未推算）"""
+    drone_last_update_time: int = 0
+    """API 返回无人机数量的时间戳"""
+    drone_recovery_secs: float = 0
+    """每架无人机恢复所需秒数（0 表示无法推算）"""
 
     # 训练室
     training_state: str = "空闲"
@@ -268,6 +316,9 @@ class BuildingInfo:
     tired_count: int = 0
     """疲劳干员数量"""
 
+    snapshot_ts: float = 0
+    """数据获取时间戳（用于推算剩余时间）"""
+
     def __post_init__(self):
         if self.clue_board is None:
             self.clue_board = []
@@ -277,12 +328,42 @@ class BuildingInfo:
         """训练剩余分钟数。"""
         return max(0, int(self.training_remaining_secs / 60))
 
+    def training_remaining_minutes_at(self, now: float) -> int:
+        """推算指定时刻的训练剩余分钟数。
+
+        Args:
+            now: Unix 时间戳（秒）
+        """
+        if self.snapshot_ts <= 0:
+            return self.training_remaining_minutes
+        remaining = self.training_remaining_secs - (now - self.snapshot_ts)
+        return max(0, int(remaining / 60))
+
+    def drone_at(self, now: float) -> int:
+        """推算指定时刻的无人机数量。
+
+        Args:
+            now: Unix 时间戳（秒）
+        """
+        if self.drone_recovery_secs <= 0 or self.drone_last_update_time <= 0:
+            return self.drone_current
+        additional = int((now - self.drone_last_update_time) / self.drone_recovery_secs)
+        return min(self.drone_base + additional, self.drone_max)
+
     @property
     def hire_refresh_remaining_minutes(self) -> int:
         """公招刷新恢复剩余分钟。"""
+        return self.hire_refresh_remaining_minutes_at(datetime.now().timestamp())
+
+    def hire_refresh_remaining_minutes_at(self, now: float) -> int:
+        """计算指定时刻的公招刷新恢复剩余分钟。
+
+        Args:
+            now: Unix 时间戳（秒）
+        """
         if self.hire_refresh_count >= 3:
             return 0
-        remaining = self.hire_complete_time - datetime.now().timestamp()
+        remaining = self.hire_complete_time - now
         return max(0, int(remaining / 60))
 
     @property
@@ -0,0 +1,98 @@
+"""明日方舟签到记录。
+
+按角色与游戏日持久化签到结果：当天已签到的角色不再向森空岛发送签到请求，
+签到获得的奖励也保存下来供界面展示。
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ATTENDANCE_STORAGE_VERSION,
+    ATTENDANCE_STORAGE_KEY,
+    ATTENDANCE_RETENTION_DAYS,
+    ATTENDANCE_SAVE_DELAY,
+    DATA_ATTENDANCE,
+)
+
+
+class AttendanceLedger:
+    """签到记录。
+
+    数据结构：UID -> 游戏日 -> {message, awards, signed_at}，
+    每个角色只保留最近 ATTENDANCE_RETENTION_DAYS 个游戏日。
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """初始化签到记录。"""
+        self._store: Store = Store(
+            hass, ATTENDANCE_STORAGE_VERSION, ATTENDANCE_STORAGE_KEY
+        )
+        self._records: dict[str, dict[str, dict[str, Any]]] = {}
+
+    async def async_load(self) -> None:
+        """加载签到记录。"""
+        stored = await self._store.async_load() or {}
+        self._records = dict(stored.get("records", {}))
+
+    def get(self, uid: str, day: str) -> dict[str, Any] | None:
+        """获取角色在指定游戏日的签到记录。
+
+        Args:
+            uid: 角色 UID
+            day: 游戏日（YYYY-MM-DD）
+
+        Returns:
+            签到记录，未签到则为 None
+        """
+        return self._records.get(uid, {}).get(day)
+
+    def last(self, uid: str) -> tuple[str, dict[str, Any]] | None:
+        """获取角色最近一次的签到记录。
+
+        Returns:
+            (游戏日, 签到记录)，无记录则为 None
+        """
+        days = self._records.get(uid)
+        if not days:
+            return None
+        day = max(days)
+        return day, days[day]
+
+    def record(
+        self, uid: str, day: str, message: str, awards: list[dict], signed_at: float
+    ) -> None:
+        """记录一次成功的签到。
+
+        Args:
+            uid: 角色 UID
+            day: 游戏日（YYYY-MM-DD）
+            message: 签到结果消息
+            awards: 获得的奖励
+            signed_at: 签到时间戳
+        """
+        days = self._records.setdefault(uid, {})
+        days[day] = {"message": message, "awards": awards, "signed_at": signed_at}
+        for old_day in sorted(days)[:-ATTENDANCE_RETENTION_DAYS]:
+            del days[old_day]
+        self._store.async_delay_save(
+            lambda: {"records": self._records}, ATTENDANCE_SAVE_DELAY
+        )
+
+    async def async_remove(self, uid: str) -> None:
+        """删除角色的全部签到记录。"""
+        if self._records.pop(uid, None) is not None:
+            await self._store.async_save({"records": self._records})
+
+
+async def async_get_attendance_ledger(hass: HomeAssistant) -> AttendanceLedger:
+    """获取（必要时创建并加载）集成共用的签到记录。"""
+    if DATA_ATTENDANCE not in hass.data:
+        ledger = AttendanceLedger(hass)
+        await ledger.async_load()
+        hass.data.setdefault(DATA_ATTENDANCE, ledger)
+    return hass.data[DATA_ATTENDANCE]
@@ -97,4 +97,16 @@ class ArknightsSignButton(CoordinatorEntity[ArknightsDataUpdateCoordinator], But
                 "last_sign_message": self._last_sign_result.get("message"),
                 "last_sign_awards": self._last_sign_result.get("awards"),
             }
+
+        # 重启后从签到记录恢复上次成功签到的结果
+        attendance = self.coordinator.attendance
+        last = attendance.last(self.coordinator.uid) if attendance else None
+        if last:
+            day, record = last
+            return {
+                "last_sign_success": True,
+                "last_sign_message": record["message"],
+                "last_sign_awards": record["awards"],
+                "last_sign_day": day,
+            }
         return None
@@ -1,13 +1,14 @@
 """明日方舟配置流程。"""
 
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 
 from .const import (
     DOMAIN,
@@ -17,12 +18,27 @@ from .const import (
     CONF_UID,
     CONF_NICKNAME,
     CONF_CHANNEL_MASTER_ID,
+    CONF_SCAN_INTERVAL,
+    CONF_EXCLUDE_VOLATILE_ATTRIBUTES,
+    CONF_AUTO_SIGN,
+    CONF_AUTO_SIGN_DELAY,
+    CONF_AUTO_SIGN_WINDOW,
+    DEFAULT_AUTO_SIGN_DELAY,
+    DEFAULT_AUTO_SIGN_WINDOW,
+    CONF_FLEET_MODE,
+    CONF_TOKEN_LIFETIME,
 )
 from .api import SklandAuth, SklandClient
 from .api.auth import AuthError
 
+if TYPE_CHECKING:
+    from .api.models import BindingCharacter
+
 _LOGGER = logging.getLogger(__name__)
 
+# 批量添加角色时子流程使用的来源
+SOURCE_BULK = "bulk"
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_TOKEN): str,
@@ -53,7 +69,9 @@ class ArknightsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             try:
                 # 验证 token 并获取凭证
-                auth = SklandAuth()
+                from homeassistant.helpers.aiohttp_client import async_get_clientsession
+                session = async_get_clientsession(self.hass)
+                auth = SklandAuth(session)
                 cred = await auth.authenticate(token)
 
                 self._token = token
@@ -61,8 +79,6 @@ class ArknightsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self._cred_token = cred.token
 
                 # 获取绑定的角色列表
-                from homeassistant.helpers.aiohttp_client import async_get_clientsession
-                session = async_get_clientsession(self.hass)
                 client = SklandClient(cred, session)
                 characters = await client.get_binding()
 
@@ -104,38 +120,91 @@ class ArknightsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_select_character(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """处理角色选择步骤。"""
+        """处理角色选择步骤（可多选）。
+
+        第一个选中的角色由本流程创建，其余角色复用同一凭证与绑定结果，
+        通过批量来源的子流程创建，无需重复认证。
+        """
+        configured = self._async_current_ids()
+        available = [
+            char
+            for char in self._characters
+            if f"{DOMAIN}_{char['uid']}" not in configured
+        ]
+        if not available:
+            return self.async_abort(reason="already_configured")
+
+        errors: dict[str, str] = {}
         if user_input is not None:
-            uid = user_input["character"]
-            # 找到选中的角色
-            for char in self._characters:
-                if char["uid"] == uid:
-                    from .api.models import BindingCharacter
-                    character = BindingCharacter(
-                        uid=char["uid"],
-                        nickname=char["nickname"],
-                        channel_master_id=char["channel_master_id"],
-                        channel_name=char["channel_name"],
-                        is_official=True,
-                        is_default=False,
+            selected = [
+                char for char in available if char["uid"] in user_input["characters"]
+            ]
+            if not selected:
+                errors["base"] = "no_selection"
+            else:
+                for char in selected[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": SOURCE_BULK},
+                            data=self._entry_data(char),
+                        )
                     )
-                    return await self._create_entry(character)
+                return await self._create_entry(self._binding_character(selected[0]))
 
-        # 构建角色选择列表
+        # 构建角色选择列表（默认全选）
         character_options = {
             char["uid"]: f"{char['nickname']} ({char['channel_name']})"
-            for char in self._characters
+            for char in available
         }
 
         return self.async_show_form(
             step_id="select_character",
             data_schema=vol.Schema(
                 {
-                    vol.Required("character"): vol.In(character_options),
+                    vol.Required(
+                        "characters", default=list(character_options)
+                    ): cv.multi_select(character_options),
                 }
             ),
+            errors=errors,
+        )
+
+    async def async_step_bulk(self, data: dict[str, Any]) -> FlowResult:
+        """批量添加：使用选择步骤中已认证的凭证直接创建配置条目。"""
+        await self.async_set_unique_id(f"{DOMAIN}_{data[CONF_UID]}")
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=f"{data[CONF_NICKNAME]} ({data[CONF_UID]})",
+            data=data,
         )
 
+    @staticmethod
+    def _binding_character(char: dict) -> "BindingCharacter":
+        """将选择列表中的角色转换为绑定角色对象。"""
+        from .api.models import BindingCharacter
+
+        return BindingCharacter(
+            uid=char["uid"],
+            nickname=char["nickname"],
+            channel_master_id=char["channel_master_id"],
+            channel_name=char["channel_name"],
+            is_official=True,
+            is_default=False,
+        )
+
+    def _entry_data(self, char: dict) -> dict[str, Any]:
+        """构建配置条目数据。"""
+        return {
+            CONF_TOKEN: self._token,
+            CONF_CRED: self._cred,
+            CONF_CRED_TOKEN: self._cred_token,
+            CONF_UID: char["uid"],
+            CONF_NICKNAME: char["nickname"],
+            CONF_CHANNEL_MASTER_ID: char["channel_master_id"],
+        }
+
     async def _create_entry(self, character) -> FlowResult:
         """创建配置条目。"""
         # 检查是否已配置该角色
@@ -144,14 +213,13 @@ class ArknightsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_create_entry(
             title=f"{character.nickname} ({character.uid})",
-            data={
-                CONF_TOKEN: self._token,
-                CONF_CRED: self._cred,
-                CONF_CRED_TOKEN: self._cred_token,
-                CONF_UID: character.uid,
-                CONF_NICKNAME: character.nickname,
-                CONF_CHANNEL_MASTER_ID: character.channel_master_id,
-            },
+            data=self._entry_data(
+                {
+                    "uid": character.uid,
+                    "nickname": character.nickname,
+                    "channel_master_id": character.channel_master_id,
+                }
+            ),
         )
 
     @staticmethod
@@ -182,9 +250,39 @@ class ArknightsOptionsFlow(config_entries.OptionsFlow):
             data_schema=vol.Schema(
                 {
                     vol.Optional(
-                        "scan_interval",
-                        default=self.config_entry.options.get("scan_interval", 10),
+                        CONF_SCAN_INTERVAL,
+                        default=self.config_entry.options.get(CONF_SCAN_INTERVAL, 10),
                     ): vol.All(vol.Coerce(int), vol.Range(min=5, max=60)),
+                    vol.Optional(
+                        CONF_EXCLUDE_VOLATILE_ATTRIBUTES,
+                        default=self.config_entry.options.get(
+                            CONF_EXCLUDE_VOLATILE_ATTRIBUTES, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_AUTO_SIGN,
+                        default=self.config_entry.options.get(CONF_AUTO_SIGN, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_AUTO_SIGN_DELAY,
+                        default=self.config_entry.options.get(
+                            CONF_AUTO_SIGN_DELAY, DEFAULT_AUTO_SIGN_DELAY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                    vol.Optional(
+                        CONF_AUTO_SIGN_WINDOW,
+                        default=self.config_entry.options.get(
+                            CONF_AUTO_SIGN_WINDOW, DEFAULT_AUTO_SIGN_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                    vol.Optional(
+                        CONF_FLEET_MODE,
+                        default=self.config_entry.options.get(CONF_FLEET_MODE, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_TOKEN_LIFETIME,
+                        default=self.config_entry.options.get(CONF_TOKEN_LIFETIME, 0),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10080)),
                 }
             ),
         )
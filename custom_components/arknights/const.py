@@ -2,19 +2,76 @@
 
 from datetime import timedelta
 
+# API 端点、应用代码与 User-Agent 定义在 api 包中（api 包不依赖 Home Assistant）
+from .api.const import (  # noqa: F401
+    SKLAND_BASE_URL,
+    HYPERGRYPH_BASE_URL,
+    SKLAND_APP_CODE,
+    USER_AGENT,
+)
+
 # 集成域名
 DOMAIN = "arknights"
 
-# API 端点
-SKLAND_BASE_URL = "https://zonai.skland.com/api/v1"
-HYPERGRYPH_BASE_URL = "https://as.hypergryph.com"
-
-# 应用代码
-SKLAND_APP_CODE = "4ca99fa6b56cc2ba"
-
 # 默认更新间隔
 DEFAULT_SCAN_INTERVAL = timedelta(minutes=10)
 
+# 玩家数据快照持久化（用于启动时快速恢复）
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_SAVE_DELAY = 30  # 秒
+
+# 账号时间序列存储
+TIMESERIES_DIR = f"{DOMAIN}_history"
+TIMESERIES_CHUNK_SIZE = 512  # 每个数据块的样本数上限
+TIMESERIES_FLUSH_INTERVAL = timedelta(hours=1)
+TIMESERIES_RETENTION = timedelta(days=180)
+
+# 长期统计：每小时的第几分钟导入上一小时的聚合
+STATISTICS_IMPORT_MINUTE = 5
+
+# 时间推算值（理智、剩余时间等）的计算粒度，与 API 轮询间隔相互独立
+CLOCK_TICK_INTERVAL = timedelta(minutes=1)
+
+# 凭证主动刷新的检查间隔（在 token 过期前刷新，避免请求失败后再刷新）
+CREDENTIAL_CHECK_INTERVAL = timedelta(minutes=1)
+
+# 批量签到的默认并发数（同一凭证内始终串行）
+SIGN_MAX_CONCURRENCY = 4
+
+# 签到记录（按角色与游戏日）
+ATTENDANCE_STORAGE_VERSION = 1
+ATTENDANCE_STORAGE_KEY = f"{DOMAIN}.attendance"
+ATTENDANCE_RETENTION_DAYS = 31
+ATTENDANCE_SAVE_DELAY = 10  # 秒
+
+# 每日自动签到
+AUTO_SIGN_CHECK_INTERVAL = timedelta(minutes=1)
+AUTO_SIGN_RETRY_BASE = timedelta(minutes=5)  # 失败重试的初始间隔，每次翻倍
+AUTO_SIGN_RETRY_MAX = timedelta(hours=2)
+DEFAULT_AUTO_SIGN_DELAY = 30  # 游戏日开始（04:00）后多少分钟开始签到
+DEFAULT_AUTO_SIGN_WINDOW = 120  # 签到分散的时间窗口（分钟）
+
+# 账号集群模式：共用一个定时器调度所有账号，刷新并发数受限
+FLEET_TICK_INTERVAL = timedelta(seconds=30)
+FLEET_MAX_WORKERS = 4
+
+# 变化事件流：合并后待消费事件的上限
+UPDATES_MAX_PENDING = 256
+
+# 集成级共享对象在 hass.data 中的键
+DATA_CLOCK_TICKER = f"{DOMAIN}_clock_ticker"
+DATA_UID_INDEX = f"{DOMAIN}_uid_index"
+DATA_AUTH = f"{DOMAIN}_auth"
+DATA_CREDENTIALS = f"{DOMAIN}_credentials"
+DATA_CREDENTIALS_UNSUB = f"{DOMAIN}_credentials_unsub"
+DATA_SIGN_SCHEDULER = f"{DOMAIN}_sign_scheduler"
+DATA_ATTENDANCE = f"{DOMAIN}_attendance"
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+# 配置条目卸载（包括重新加载）时发送的信号，参数为条目 ID
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
+
 # 配置键
 CONF_TOKEN = "token"
 CONF_CRED = "cred"
@@ -23,11 +80,22 @@ CONF_UID = "uid"
 CONF_NICKNAME = "nickname"
 CONF_CHANNEL_MASTER_ID = "channel_master_id"
 
+# 选项键
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_EXCLUDE_VOLATILE_ATTRIBUTES = "exclude_volatile_attributes"
+CONF_AUTO_SIGN = "auto_sign"
+CONF_AUTO_SIGN_DELAY = "auto_sign_delay"
+CONF_AUTO_SIGN_WINDOW = "auto_sign_window"
+CONF_FLEET_MODE = "fleet_mode"
+CONF_TOKEN_LIFETIME = "token_lifetime"  # 分钟，0 表示从被动刷新中学习
+
+# 可在运行中直接生效、无需重新加载配置条目的选项
+HOT_APPLY_OPTIONS = frozenset(
+    {CONF_SCAN_INTERVAL, CONF_AUTO_SIGN, CONF_AUTO_SIGN_DELAY, CONF_AUTO_SIGN_WINDOW}
+)
+
 # 理智恢复速率：每 6 分钟恢复 1 点
 SANITY_RECOVERY_RATE = 360  # 秒
 
 # 平台
 PLATFORMS = ["sensor", "button"]
-
-# User-Agent
-USER_AGENT = "Skland/1.32.1 (com.hypergryph.skland; build:103201004; Android 33; ) Okhttp/4.11.0"
@@ -1,26 +1,124 @@
 """明日方舟数据协调器。"""
 
 import logging
-from datetime import timedelta
-from typing import Callable, Awaitable
+from datetime import datetime, timedelta
+from collections.abc import AsyncIterator, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Awaitable, TypeVar
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.exceptions import ConfigEntryAuthFailed
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    DATA_AUTH,
+    DATA_CREDENTIALS,
+    DATA_CREDENTIALS_UNSUB,
+    CREDENTIAL_CHECK_INTERVAL,
+    UPDATES_MAX_PENDING,
+    DEFAULT_SCAN_INTERVAL,
+    CLOCK_TICK_INTERVAL,
+    SNAPSHOT_STORAGE_VERSION,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_SAVE_DELAY,
+)
 from .api import SklandClient, Credential, PlayerStatus
+from .api.clock import Clock, game_day, system_clock
+from .api.credentials import CredentialManager
 from .api.client import UnauthorizedError, RequestError
-from .api.auth import SklandAuth, AuthError
+from .payload import ACCOUNT_PAYLOAD, serialize_player_status
+
+if TYPE_CHECKING:
+    from .api.auth import SklandAuth
+    from .attendance import AttendanceLedger
+    from .updates import ChangeEvent
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+EntityValueFn = Callable[[PlayerStatus, float], tuple[Any, dict[str, Any] | None]]
+"""实体值计算函数：(玩家数据, 当前时间戳) -> (状态值, 额外属性)"""
+
+
+def get_auth(hass: HomeAssistant) -> "SklandAuth":
+    """获取集成内共享的认证客户端。
+
+    认证模块仅在 token 刷新或重新认证时才需要，因此按需导入并创建；
+    与 API 客户端共用 Home Assistant 的 aiohttp 会话。
+    """
+    if DATA_AUTH not in hass.data:
+        from homeassistant.helpers.aiohttp_client import async_get_clientsession
+        from .api.auth import SklandAuth
+
+        hass.data[DATA_AUTH] = SklandAuth(async_get_clientsession(hass))
+    return hass.data[DATA_AUTH]
+
+
+def get_credential_manager(hass: HomeAssistant) -> CredentialManager:
+    """获取集成内共享的凭证管理器。"""
+    if DATA_CREDENTIALS not in hass.data:
+        hass.data[DATA_CREDENTIALS] = CredentialManager(lambda: get_auth(hass))
+    return hass.data[DATA_CREDENTIALS]
+
+
+@callback
+def async_register_credential(
+    hass: HomeAssistant,
+    original_token: str,
+    client: SklandClient,
+    listener: Callable[[Credential], Awaitable[None]] | None = None,
+    token_lifetime: float | None = None,
+) -> CALLBACK_TYPE:
+    """将客户端登记到凭证管理器，并按需启动主动刷新检查。
+
+    第一个客户端登记时启动定时检查，最后一个客户端注销时停止。
+    token_lifetime（秒）为空时从被动刷新中学习 token 有效期。
+
+    Returns:
+        注销该客户端的回调
+    """
+    credentials = get_credential_manager(hass)
+    unregister = credentials.register(original_token, client, listener, token_lifetime)
+
+    if DATA_CREDENTIALS_UNSUB not in hass.data:
+
+        @callback
+        def _async_check(now: datetime) -> None:
+            hass.async_create_background_task(
+                credentials.async_refresh_due(), f"{DOMAIN}_credential_refresh"
+            )
+
+        hass.data[DATA_CREDENTIALS_UNSUB] = async_track_time_interval(
+            hass, _async_check, CREDENTIAL_CHECK_INTERVAL
+        )
+
+    @callback
+    def _unregister() -> None:
+        unregister()
+        if not credentials.has_clients and DATA_CREDENTIALS_UNSUB in hass.data:
+            hass.data.pop(DATA_CREDENTIALS_UNSUB)()
+
+    return _unregister
+
+
+def get_snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """获取配置条目对应的玩家数据快照存储。"""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{SNAPSHOT_STORAGE_KEY}.{entry_id}")
+
 
 class ArknightsDataUpdateCoordinator(DataUpdateCoordinator[PlayerStatus]):
     """明日方舟数据协调器。
 
-    负责定时从森空岛 API 获取玩家数据，并在 token 过期时自动刷新。
-    支持完整的认证恢复：当 refresh_token 失败时，使用原始 token 重新认证。
+    负责定时从森空岛 API 获取玩家数据，并在 token 过期时通过凭证管理器自动恢复：
+    先 refresh_token，失败时使用原始 token 重新认证。
+    每次成功更新后将玩家数据快照持久化，启动时可先从快照恢复实体状态。
+
+    实体的状态值由注册的计算函数统一计算，并按 (数据版本, 时钟刻度) 缓存，
+    同一账号下的所有实体共享同一份计算结果。更新时只通知状态值或属性
+    实际发生变化的实体，避免无意义的状态写入。
     """
 
     def __init__(
@@ -30,8 +128,11 @@ class ArknightsDataUpdateCoordinator(DataUpdateCoordinator[PlayerStatus]):
         uid: str,
         nickname: str,
         original_token: str,
-        on_credential_update: Callable[[Credential], Awaitable[None]] | None = None,
-        update_interval: timedelta = DEFAULT_SCAN_INTERVAL,
+        credentials: CredentialManager,
+        update_interval: timedelta | None = DEFAULT_SCAN_INTERVAL,
+        entry_id: str | None = None,
+        clock: Clock = system_clock,
+        attendance: "AttendanceLedger | None" = None,
     ) -> None:
         """初始化协调器。
 
@@ -41,8 +142,11 @@ class ArknightsDataUpdateCoordinator(DataUpdateCoordinator[PlayerStatus]):
             uid: 角色 UID
             nickname: 角色昵称
             original_token: 用户原始 token（用于重新认证）
-            on_credential_update: 凭证更新回调（用于持久化新凭证）
-            update_interval: 更新间隔
+            credentials: 凭证管理器（负责 token 刷新与重新认证）
+            update_interval: 更新间隔（为 None 时不自行轮询，由集群协调器调度）
+            entry_id: 配置条目 ID（用于持久化数据快照，为空则不持久化）
+            clock: 时钟（每次计算实体值时取一次时间快照）
+            attendance: 签到记录（当天已签到时跳过签到请求）
         """
         super().__init__(
             hass,
@@ -53,70 +157,249 @@ class ArknightsDataUpdateCoordinator(DataUpdateCoordinator[PlayerStatus]):
         self.client = client
         self.uid = uid
         self.nickname = nickname
-        self._auth = SklandAuth()
+        self.clock = clock
+        self.entry_id = entry_id
+        self.attendance = attendance
         self._original_token = original_token
-        self._on_credential_update = on_credential_update
+        self._credentials = credentials
+        self._snapshot_store = (
+            get_snapshot_store(hass, entry_id) if entry_id is not None else None
+        )
+
+        # 数据版本号：每次获得新的玩家数据时递增
+        self.data_version = 0
+        self._value_fns: dict[str, EntityValueFn] = {}
+        self._time_derived_keys: set[str] = set()
+        self._values: dict[str, tuple[Any, dict[str, Any] | None]] = {}
+        self._values_stamp: tuple[int, int] | None = None
+        self._changed_keys: set[str] = set()
+        # 状态版本号：数据更新或时间推算值变化时递增
+        # 以毫秒时间戳为初值，避免重载后与客户端持有的旧版本号冲突
+        self.state_version = int(clock() * 1000)
+        # 当前实体值缓存所用的时间快照
+        self.values_now = 0.0
+        # 按状态版本缓存的序列化结果（供 WebSocket 等使用）
+        self.payload_cache: dict[str, tuple[int, Any]] = {}
+        self._notified_success: bool | None = None
+        # 因值未变化而跳过的实体状态写入次数（用于诊断）
+        self.suppressed_writes = 0
+
+    async def async_set_update_interval(self, update_interval: timedelta) -> None:
+        """在运行中修改轮询间隔，无需重建协调器。
+
+        间隔缩短时立即刷新一次，使新的间隔马上生效；
+        间隔延长时在当前计划的更新之后按新的间隔继续。
+
+        Args:
+            update_interval: 新的更新间隔
+        """
+        old_interval = self.update_interval
+        self.update_interval = update_interval
+        if old_interval is not None and update_interval < old_interval:
+            await self.async_request_refresh()
+
+    def iter_updates(
+        self,
+        categories: Iterable[str] | None = None,
+        max_pending: int = UPDATES_MAX_PENDING,
+    ) -> AsyncIterator["ChangeEvent"]:
+        """以异步迭代器的形式订阅本账号的数据变化事件。
+
+        Args:
+            categories: 只关注的类别（sanity / building / roster / progress / profile）
+            max_pending: 待处理事件（合并后）的上限
+        """
+        from .updates import iter_updates
+
+        return iter_updates([self], categories, max_pending)
+
+    def register_entity_values(
+        self,
+        value_fns: dict[str, EntityValueFn],
+        time_derived: set[str] | None = None,
+    ) -> None:
+        """注册实体值计算函数。
+
+        Args:
+            value_fns: 实体 key -> 计算函数
+            time_derived: 其中随时间推算变化的实体 key（时钟刻度时重新计算）
+        """
+        self._value_fns.update(value_fns)
+        self._time_derived_keys.update(time_derived or ())
+        self._values_stamp = None
+
+    def get_entity_value(self, key: str) -> tuple[Any, dict[str, Any] | None]:
+        """获取实体的状态值与额外属性。
+
+        同一数据版本、同一时钟刻度内只计算一次。
+
+        Args:
+            key: 实体 key
+
+        Returns:
+            (状态值, 额外属性)
+        """
+        self._refresh_values(self.clock())
+        return self._values.get(key, (None, None))
 
-    async def _try_refresh_token(self) -> bool:
-        """尝试刷新 token。
+    def refresh_state(self) -> int:
+        """按当前时间刷新实体值缓存。
 
         Returns:
-            是否刷新成功
+            当前状态版本号
         """
-        try:
-            new_token = await self._auth.refresh_token(self.client.credential.cred)
-            new_cred = Credential(
-                cred=self.client.credential.cred,
-                token=new_token,
-                user_id=self.client.credential.user_id,
-            )
-            await self._update_credential(new_cred)
-            _LOGGER.info("Token 刷新成功")
-            return True
-        except Exception as e:
-            _LOGGER.warning("Token 刷新失败，将尝试重新认证: %s", e)
+        self._refresh_values(self.clock())
+        return self.state_version
+
+    def _refresh_values(self, now: float) -> None:
+        """按需重新计算全部实体值。
+
+        使用同一时间快照计算：数据版本与时钟刻度均未变化时直接复用缓存；
+        仅时钟刻度变化时只重新计算随时间推算变化的实体。
+        值发生变化的实体 key 会累计到 _changed_keys，直到下次通知监听器。
+        状态版本只在实体值或序列化结果实际变化时递增，
+        数据相同的轮询不会产生新的状态版本。
+
+        Args:
+            now: Unix 时间戳（秒）
+        """
+        stamp = (self.data_version, int(now // CLOCK_TICK_INTERVAL.total_seconds()))
+        if stamp == self._values_stamp:
+            return
+
+        if not self.data:
+            keys: set[str] = set()
+            new_values: dict[str, tuple[Any, dict[str, Any] | None]] = {}
+        elif self._values_stamp is not None and self._values_stamp[0] == stamp[0]:
+            keys = self._time_derived_keys
+            new_values = {**self._values}
+        else:
+            keys = set(self._value_fns)
+            new_values = {}
+
+        for key in keys:
+            new_values[key] = self._value_fns[key](self.data, now)
+
+        old_values = self._values
+        old_stamp = self._values_stamp
+        self._values = new_values
+        self._values_stamp = stamp
+        self.values_now = now
+        changed = {
+            key
+            for key in set(old_values) | set(new_values)
+            if old_values.get(key) != new_values.get(key)
+        }
+        self._changed_keys.update(changed)
+        if (
+            changed
+            or old_stamp is None
+            or (old_stamp[0] != stamp[0] and self._payload_changed(now))
+        ):
+            self.state_version += 1
+
+    def _payload_changed(self, now: float) -> bool:
+        """检查新数据的序列化结果是否与缓存的不同（实体值未变化时调用）。
+
+        序列化结果还包含头像、助战干员等不对应实体值的字段。
+        尚无缓存时无需比较，下次读取时会按新数据序列化。
+        """
+        cached = self.payload_cache.get(ACCOUNT_PAYLOAD)
+        if cached is None or not self.data:
             return False
+        payload = serialize_player_status(self.data, now)
+        payload["version"] = cached[0]
+        return payload != cached[1]
+
+    @callback
+    def async_tick(self) -> None:
+        """时钟刻度：基于缓存数据重新推算时间相关的实体值。
+
+        不请求 API，只在显示值实际变化时通知对应实体。
+        """
+        if not self.data:
+            return
+        self._refresh_values(self.clock())
+        if self._changed_keys:
+            self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """只通知值发生变化的实体。
+
+        以实体 key 作为 context 注册的监听器仅在其值变化时被调用；
+        无 context 的监听器以及可用性变化时的所有监听器照常调用。
+        """
+        self._refresh_values(self.clock())
+        changed, self._changed_keys = self._changed_keys, set()
+        notify_all = self._notified_success != self.last_update_success
+        self._notified_success = self.last_update_success
 
-    async def _try_reauthenticate(self) -> bool:
-        """使用原始 token 重新进行完整认证。
+        for update_callback, context in list(self._listeners.values()):
+            if notify_all or context not in self._value_fns or context in changed:
+                update_callback()
+            else:
+                self.suppressed_writes += 1
+
+    async def async_restore_snapshot(self) -> bool:
+        """从持久化快照恢复上次的玩家数据。
 
         Returns:
-            是否重新认证成功
+            是否恢复成功
         """
+        if self._snapshot_store is None:
+            return False
+
+        stored = await self._snapshot_store.async_load()
+        if not stored:
+            return False
+
         try:
-            _LOGGER.info("正在使用原始 token 重新认证...")
-            new_cred = await self._auth.authenticate(self._original_token)
-            await self._update_credential(new_cred)
-            _LOGGER.info("重新认证成功")
-            return True
-        except AuthError as e:
-            _LOGGER.error("重新认证失败: %s", e)
+            snapshot = PlayerStatus.from_dict(stored["player"])
+        except (KeyError, TypeError, ValueError) as e:
+            _LOGGER.warning("玩家数据快照无效，已忽略: %s", e)
             return False
 
-    async def _update_credential(self, new_cred: Credential) -> None:
-        """更新凭证并持久化。
+        self.data = snapshot
+        self.data_version += 1
+        _LOGGER.debug("已从快照恢复玩家数据: %s", self.uid)
+        return True
+
+    def _save_snapshot(self, data: PlayerStatus) -> None:
+        """延迟写入玩家数据快照。"""
+        if self._snapshot_store is None:
+            return
+        self._snapshot_store.async_delay_save(
+            lambda: {"player": data.as_dict()}, SNAPSHOT_SAVE_DELAY
+        )
+
+    async def _async_call_with_recovery(
+        self, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """执行 API 请求，认证失效时通过凭证管理器恢复后重试。
+
+        刷新与重新认证由凭证管理器统一执行，同一原始 token 下
+        并发失败的多个角色只会触发一次。
 
         Args:
-            new_cred: 新凭证
-        """
-        self.client.update_credential(new_cred)
+            request: 发起请求的函数
 
-        # 调用回调函数持久化凭证
-        if self._on_credential_update:
-            try:
-                await self._on_credential_update(new_cred)
-                _LOGGER.debug("凭证已持久化到 config_entry")
-            except Exception as e:
-                _LOGGER.warning("凭证持久化失败（不影响运行）: %s", e)
+        Raises:
+            UnauthorizedError: 认证彻底失败
+        """
+        return await self._credentials.async_call(
+            self._original_token, self.client, request
+        )
 
     async def _async_update_data(self) -> PlayerStatus:
-        """从 API 获取最新数据。
+        """从 API 获取最新数据并保存快照。"""
+        data = await self._async_fetch_player_info()
+        self.data_version += 1
+        self._save_snapshot(data)
+        return data
 
-        认证恢复策略：
-        1. 首先尝试正常请求
-        2. 若 Token 过期，尝试 refresh_token
-        3. 若 refresh 失败，使用原始 token 重新完整认证
-        4. 若仍失败，抛出 ConfigEntryAuthFailed
+    async def _async_fetch_player_info(self) -> PlayerStatus:
+        """从 API 获取玩家数据。
 
         Returns:
             玩家状态信息
@@ -126,39 +409,24 @@ class ArknightsDataUpdateCoordinator(DataUpdateCoordinator[PlayerStatus]):
             ConfigEntryAuthFailed: 认证彻底失败（需要重新配置）
         """
         try:
-            return await self.client.get_player_info(self.uid)
-
+            return await self._async_call_with_recovery(
+                lambda: self.client.get_player_info(self.uid)
+            )
         except UnauthorizedError as e:
-            _LOGGER.warning("Token 过期，开始恢复流程: %s", e)
-
-            # 第一步：尝试刷新 token
-            if await self._try_refresh_token():
-                try:
-                    return await self.client.get_player_info(self.uid)
-                except UnauthorizedError:
-                    _LOGGER.warning("刷新后仍然失败，尝试完整重新认证")
-
-            # 第二步：使用原始 token 重新完整认证
-            if await self._try_reauthenticate():
-                try:
-                    return await self.client.get_player_info(self.uid)
-                except UnauthorizedError as final_error:
-                    _LOGGER.error("重新认证后仍然失败: %s", final_error)
-                    raise ConfigEntryAuthFailed(
-                        "认证已过期且无法恢复，请检查原始 Token 是否仍有效，或重新配置"
-                    ) from final_error
-
-            # 第三步：彻底失败
+            _LOGGER.error("认证恢复失败: %s", e)
             raise ConfigEntryAuthFailed(
-                "认证已过期，原始 Token 可能已失效，请重新配置"
+                "认证已过期且无法恢复，请检查原始 Token 是否仍有效，或重新配置"
             ) from e
-
         except RequestError as e:
             raise UpdateFailed(f"获取数据失败: {e}") from e
 
     async def async_sign(self, channel_master_id: str) -> dict:
         """执行签到。
 
+        签到时遇到认证问题只恢复凭证并重试签到，不会额外拉取玩家数据。
+        同一凭证下的签到按凭证串行执行，不同凭证之间可以并发。
+        当天已有签到记录时直接返回，不再发送签到请求。
+
         Args:
             channel_master_id: 渠道 ID
 
@@ -166,31 +434,33 @@ class ArknightsDataUpdateCoordinator(DataUpdateCoordinator[PlayerStatus]):
             签到结果
         """
         try:
-            result = await self.client.sign(self.uid, channel_master_id)
+            # 同一凭证下的签到串行执行
+            async with self._credentials.lock(self._original_token):
+                now = self.clock()
+                day = game_day(now)
+                if self.attendance is not None and self.attendance.get(self.uid, day):
+                    _LOGGER.debug("今日已签到（本地记录），跳过签到请求: %s", self.uid)
+                    return {"success": True, "message": "今日已签到", "awards": []}
+
+                result = await self._async_call_with_recovery(
+                    lambda: self.client.sign(self.uid, channel_master_id)
+                )
+                if result.success and self.attendance is not None:
+                    self.attendance.record(
+                        self.uid, day, result.message, result.awards, now
+                    )
             return {
                 "success": result.success,
                 "message": result.message,
                 "awards": result.awards,
             }
-        except UnauthorizedError:
-            # 签到时遇到认证问题，触发一次数据刷新来恢复认证
-            _LOGGER.warning("签到时遇到认证问题，尝试恢复...")
-            try:
-                await self.async_refresh()
-                # 重试签到
-                result = await self.client.sign(self.uid, channel_master_id)
-                return {
-                    "success": result.success,
-                    "message": result.message,
-                    "awards": result.awards,
-                }
-            except Exception as retry_error:
-                _LOGGER.error("签到重试失败: %s", retry_error)
-                return {
-                    "success": False,
-                    "message": f"认证失败: {retry_error}",
-                    "awards": [],
-                }
+        except UnauthorizedError as e:
+            _LOGGER.error("签到认证失败: %s", e)
+            return {
+                "success": False,
+                "message": f"认证失败: {e}",
+                "awards": [],
+            }
         except Exception as e:
             _LOGGER.error("签到失败: %s", e)
             return {
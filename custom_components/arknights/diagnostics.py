@@ -0,0 +1,39 @@
+"""明日方舟诊断信息。"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_TOKEN, CONF_CRED, CONF_CRED_TOKEN
+from .coordinator import ArknightsDataUpdateCoordinator, get_credential_manager
+
+TO_REDACT = {CONF_TOKEN, CONF_CRED, CONF_CRED_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """获取配置条目的诊断信息。"""
+    coordinator: ArknightsDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+        "coordinator"
+    ]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "data_version": coordinator.data_version,
+            "suppressed_writes": coordinator.suppressed_writes,
+            "update_interval": str(coordinator.update_interval),
+            "fleet_mode": hass.data[DOMAIN][entry.entry_id]["fleet"],
+        },
+        "client": {
+            "clock_offset": round(coordinator.client.clock_offset, 3),
+            "clock_samples": coordinator.client.clock_samples,
+        },
+        "credentials": get_credential_manager(hass).stats(entry.data[CONF_TOKEN]),
+    }
@@ -0,0 +1,197 @@
+"""明日方舟账号集群调度。
+
+账号较多时，每个配置条目各自持有定时器与刷新任务的开销会线性增长。
+集群模式下各账号的协调器不再自行轮询（update_interval 为 None），
+由集成共用的一个定时器按各账号的更新间隔批量调度，
+并通过有界的并发上限执行刷新；只有数据实际变化的实体会被通知。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DOMAIN,
+    DATA_FLEET,
+    FLEET_TICK_INTERVAL,
+    FLEET_MAX_WORKERS,
+    UPDATES_MAX_PENDING,
+)
+from .api import PlayerStatus
+from .coordinator import ArknightsDataUpdateCoordinator
+from .updates import ChangeEvent, iter_updates
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _FleetMember:
+    """集群中的账号。"""
+
+    coordinator: ArknightsDataUpdateCoordinator
+    interval: float
+    """更新间隔（秒）"""
+    next_due: float
+    """下次计划刷新的时间戳（按协调器的时钟）"""
+    in_flight: bool = False
+    """是否正在刷新"""
+
+
+class ArknightsFleetCoordinator:
+    """账号集群协调器。
+
+    第一个账号加入时启动定时器，最后一个账号移除时停止。
+    所有账号的最新玩家数据保存在 data 中（UID -> 玩家状态）。
+    """
+
+    def __init__(self, hass: HomeAssistant, max_workers: int = FLEET_MAX_WORKERS) -> None:
+        """初始化集群协调器。
+
+        Args:
+            hass: Home Assistant 实例
+            max_workers: 同时进行的刷新数上限
+        """
+        self.hass = hass
+        self.data: dict[str, PlayerStatus] = {}
+        self._members: dict[str, _FleetMember] = {}
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._unsub: CALLBACK_TYPE | None = None
+        # 调度统计（用于诊断）
+        self.refreshes = 0
+        self.changed = 0
+
+    @callback
+    def async_add(
+        self, coordinator: ArknightsDataUpdateCoordinator, interval: timedelta
+    ) -> CALLBACK_TYPE:
+        """加入账号。
+
+        协调器应已完成（或已在后台开始）首次刷新，下次刷新在一个更新间隔之后。
+
+        Args:
+            coordinator: 账号的数据协调器（update_interval 应为 None）
+            interval: 该账号的更新间隔
+
+        Returns:
+            移除该账号的回调
+        """
+        uid = coordinator.uid
+        seconds = interval.total_seconds()
+        self._members[uid] = _FleetMember(
+            coordinator, seconds, coordinator.clock() + seconds
+        )
+        if coordinator.data is not None:
+            self.data[uid] = coordinator.data
+
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_tick, FLEET_TICK_INTERVAL
+            )
+            _LOGGER.debug("账号集群调度已启动")
+
+        @callback
+        def _remove() -> None:
+            member = self._members.get(uid)
+            if member is not None and member.coordinator is coordinator:
+                del self._members[uid]
+                self.data.pop(uid, None)
+            if not self._members and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+                _LOGGER.debug("账号集群调度已停止")
+
+        return _remove
+
+    @callback
+    def async_set_interval(self, uid: str, interval: timedelta) -> None:
+        """修改账号的更新间隔。
+
+        间隔缩短时下次刷新随之提前；间隔延长时在下次刷新之后生效。
+        """
+        member = self._members.get(uid)
+        if member is None:
+            return
+        seconds = interval.total_seconds()
+        member.next_due = min(member.next_due, member.coordinator.clock() + seconds)
+        member.interval = seconds
+
+    def iter_updates(
+        self,
+        categories: Iterable[str] | None = None,
+        max_pending: int = UPDATES_MAX_PENDING,
+    ) -> AsyncIterator[ChangeEvent]:
+        """以异步迭代器的形式订阅集群内所有账号的数据变化事件。
+
+        只包含调用时已加入集群的账号。
+
+        Args:
+            categories: 只关注的类别（sanity / building / roster / progress / profile）
+            max_pending: 待处理事件（合并后）的上限
+        """
+        return iter_updates(
+            [member.coordinator for member in self._members.values()],
+            categories,
+            max_pending,
+        )
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """调度到期的账号。
+
+        定时器只决定检查的时机，是否到期按各账号协调器的时钟判断。
+        """
+        due = sorted(
+            (
+                member
+                for member in self._members.values()
+                if not member.in_flight
+                and member.next_due <= member.coordinator.clock()
+            ),
+            key=lambda member: member.next_due,
+        )
+        if not due:
+            return
+
+        for member in due:
+            member.in_flight = True
+        self.hass.async_create_background_task(
+            self._async_refresh_batch(due), f"{DOMAIN}_fleet_refresh"
+        )
+
+    async def _async_refresh_batch(self, members: list[_FleetMember]) -> None:
+        """刷新一批账号（受并发上限约束）。"""
+        await asyncio.gather(*(self._async_refresh_member(member) for member in members))
+
+    async def _async_refresh_member(self, member: _FleetMember) -> None:
+        """刷新单个账号。
+
+        协调器只通知值实际变化的实体，数据版本未变化（更新失败）时不更新集群数据。
+        """
+        coordinator = member.coordinator
+        data_version = coordinator.data_version
+        try:
+            async with self._semaphore:
+                await coordinator.async_refresh()
+        finally:
+            member.in_flight = False
+            member.next_due = coordinator.clock() + member.interval
+            self.refreshes += 1
+
+        if coordinator.data_version != data_version and coordinator.data is not None:
+            self.data[coordinator.uid] = coordinator.data
+            self.changed += 1
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> ArknightsFleetCoordinator:
+    """获取（必要时创建）集成共用的账号集群协调器。"""
+    if DATA_FLEET not in hass.data:
+        hass.data[DATA_FLEET] = ArknightsFleetCoordinator(hass)
+    return hass.data[DATA_FLEET]
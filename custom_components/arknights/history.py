@@ -0,0 +1,161 @@
+"""明日方舟历史数据查询与降采样。
+
+从记录器读取传感器历史，并在服务端降采样到指定点数，
+前端绘图的数据量因此与原始样本数量无关。
+
+降采样使用纯 Python 实现（对样本只遍历常数次，耗时与样本数线性相关），
+避免为集成引入 numpy 依赖。
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+Point = tuple[float, float]
+"""时间序列数据点：(Unix 时间戳, 数值)"""
+
+DOWNSAMPLE_LTTB = "lttb"
+DOWNSAMPLE_MINMAX = "minmax"
+DOWNSAMPLE_METHODS = (DOWNSAMPLE_LTTB, DOWNSAMPLE_MINMAX)
+
+
+def lttb(points: list[Point], threshold: int) -> list[Point]:
+    """Largest-Triangle-Three-Buckets 降采样。
+
+    保留首尾两点，其余每个桶选出与相邻桶构成三角形面积最大的点，
+    能较好地保留曲线形状。
+
+    Args:
+        points: 按时间升序排列的数据点
+        threshold: 目标点数
+
+    Returns:
+        降采样后的数据点
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    every = (count - 2) / (threshold - 2)
+
+    sampled = [points[0]]
+    a = 0
+    for i in range(threshold - 2):
+        # 下一个桶的平均点
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, count)
+        next_len = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / next_len
+        avg_y = sum(ys[next_start:next_end]) / next_len
+
+        # 当前桶中与 a 点、平均点构成最大三角形的点
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        dx = ax - avg_x
+        dy = avg_y - ay
+        areas = [
+            abs(dx * (y - ay) - (ax - x) * dy)
+            for x, y in zip(xs[start:end], ys[start:end])
+        ]
+        a = start + areas.index(max(areas))
+        sampled.append(points[a])
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def minmax_buckets(points: list[Point], threshold: int) -> list[Point]:
+    """最小/最大值分桶降采样。
+
+    将数据按点数均分为 threshold // 2 个桶，每桶保留最小值与最大值两点，
+    适合需要保留峰谷的场景。
+
+    Args:
+        points: 按时间升序排列的数据点
+        threshold: 目标点数
+
+    Returns:
+        降采样后的数据点
+    """
+    count = len(points)
+    buckets = threshold // 2
+    if threshold >= count or buckets < 1:
+        return list(points)
+
+    size = count / buckets
+    sampled: list[Point] = []
+    for i in range(buckets):
+        bucket = points[int(i * size):int((i + 1) * size)]
+        if not bucket:
+            continue
+        low = min(bucket, key=lambda p: p[1])
+        high = max(bucket, key=lambda p: p[1])
+        sampled.extend(sorted({low, high}))
+    return sampled
+
+
+def downsample(points: list[Point], threshold: int, method: str) -> list[Point]:
+    """按指定方法降采样。"""
+    if method == DOWNSAMPLE_MINMAX:
+        return minmax_buckets(points, threshold)
+    return lttb(points, threshold)
+
+
+async def async_get_recorder_series(
+    hass: HomeAssistant,
+    uid: str,
+    metric: str,
+    start_time: datetime,
+    end_time: datetime,
+) -> list[Point] | None:
+    """从记录器读取指定账号某项指标的数值序列。
+
+    Args:
+        hass: Home Assistant 实例
+        uid: 角色 UID
+        metric: 传感器 key（如 sanity、drone）
+        start_time: 起始时间
+        end_time: 结束时间
+
+    Returns:
+        按时间升序排列的数据点；对应实体不存在时返回 None
+    """
+    from homeassistant.components.recorder import get_instance, history
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{uid}_{metric}"
+    )
+    if entity_id is None:
+        return None
+
+    states = await get_instance(hass).async_add_executor_job(
+        lambda: history.state_changes_during_period(
+            hass,
+            start_time,
+            end_time,
+            entity_id=entity_id,
+            no_attributes=True,
+            include_start_time_state=True,
+        )
+    )
+
+    points: list[Point] = []
+    for state in states.get(entity_id, []):
+        try:
+            value = float(state.state)
+        except ValueError:
+            # unknown / unavailable 等非数值状态
+            continue
+        points.append((state.last_changed.timestamp(), value))
+    return points
@@ -0,0 +1,239 @@
+"""明日方舟数据序列化。
+
+将玩家数据转换为前端使用的字典结构，并按协调器状态版本缓存；
+同时提供 JSON Patch 风格的增量计算。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .api.models import PlayerStatus
+
+if TYPE_CHECKING:
+    from .coordinator import ArknightsDataUpdateCoordinator
+
+# 线索板：线索名称 -> 位置编号（1-7）
+CLUE_MAP = {
+    "RHINE": 1,
+    "PENGUIN": 2,
+    "BLACKSTEEL": 3,
+    "URSUS": 4,
+    "GLASGOW": 5,
+    "KJERAG": 6,
+    "RHODES": 7,
+}
+
+ACCOUNT_PAYLOAD = "account"
+
+
+def serialize_player_status(player: PlayerStatus, now: float) -> dict[str, Any]:
+    """序列化玩家数据。
+
+    Args:
+        player: 玩家数据
+        now: 推算理智等时间相关字段所用的时间戳
+
+    Returns:
+        可 JSON 序列化的账号数据
+    """
+    # 构建响应数据
+    response = {
+        "uid": player.uid,
+        "name": player.name,
+        "level": player.level,
+        "avatar_url": player.avatar_url,
+        "secretary_id": player.secretary_id,
+        "secretary_skin_id": player.secretary_skin_id,
+        "resume": player.resume,
+        "main_stage_progress": player.main_stage_progress,
+        "char_count": player.char_count,
+        "furniture_count": player.furniture_count,
+        "skin_count": player.skin_count,
+        "register_ts": player.register_ts,
+        "last_online_ts": player.last_online_ts,
+        # 理智
+        "sanity": {
+            "current": player.sanity.current_at(now),
+            "max": player.sanity.max,
+            "minutes_to_full": player.sanity.minutes_to_full_at(now),
+            "complete_recovery_time": player.sanity.complete_recovery_time,
+        },
+    }
+
+    # 基建信息（可能为 None）
+    if player.building:
+        # 线索板详情：显示1-7哪个有哪个没有
+        clue_board_status = {}
+        for name, slot_id in CLUE_MAP.items():
+            clue_board_status[slot_id] = name in player.building.clue_board
+
+        response["building"] = {
+            "trading_stock": player.building.trading_stock,
+            "trading_stock_limit": player.building.trading_stock_limit,
+            "manufacture_complete": player.building.manufacture_complete,
+            "manufacture_capacity": player.building.manufacture_capacity,
+            "drone_current": player.building.drone_at(now),
+            "drone_max": player.building.drone_max,
+            "training_state": player.building.training_state,
+            "training_remaining_secs": player.building.training_remaining_secs,
+            "trainee_char_id": player.building.trainee_char_id,
+            "hire_refresh_count": player.building.hire_refresh_count,
+            "recruit_finished": player.building.recruit_finished,
+            "recruit_total": player.building.recruit_total,
+            "resting_count": player.building.resting_count,
+            "rested_count": player.building.rested_count,
+            "clue_own": player.building.clue_own,
+            "clue_received": player.building.clue_received,
+            "clue_collected": player.building.clue_collected,
+            "clue_board": clue_board_status,
+            "tired_count": player.building.tired_count,
+        }
+    else:
+        response["building"] = None
+
+    # 蚀刻章
+    response["medal_count"] = player.medal_count
+
+    # 剿灭
+    if player.campaign:
+        response["campaign"] = {
+            "current": player.campaign.current,
+            "total": player.campaign.total,
+        }
+    else:
+        response["campaign"] = None
+
+    # 日/周常任务
+    if player.routine:
+        response["routine"] = {
+            "daily_current": player.routine.daily_current,
+            "daily_total": player.routine.daily_total,
+            "weekly_current": player.routine.weekly_current,
+            "weekly_total": player.routine.weekly_total,
+        }
+    else:
+        response["routine"] = None
+
+    # 保全派驻
+    if player.tower:
+        response["tower"] = {
+            "higher_current": player.tower.higher_current,
+            "higher_total": player.tower.higher_total,
+            "lower_current": player.tower.lower_current,
+            "lower_total": player.tower.lower_total,
+            "term_ts": player.tower.term_ts,
+        }
+    else:
+        response["tower"] = None
+
+    # 助战干员
+    response["assist_chars"] = [
+        {
+            "char_id": ac.char_id,
+            "skin_id": ac.skin_id,
+            "level": ac.level,
+            "evolve_phase": ac.evolve_phase,
+            "potential_rank": ac.potential_rank,
+            "skill_id": ac.skill_id,
+            "skill_level": ac.skill_level,
+            "specialize_level": ac.specialize_level,
+        }
+        for ac in player.assist_chars
+    ]
+
+    return response
+
+
+def get_account_payload(
+    coordinator: ArknightsDataUpdateCoordinator,
+) -> tuple[int, dict[str, Any]] | None:
+    """获取账号数据（按状态版本缓存）。
+
+    同一状态版本内重复请求直接复用已序列化的结果。
+
+    Args:
+        coordinator: 账号对应的协调器
+
+    Returns:
+        (状态版本, 账号数据)，尚无数据时返回 None
+    """
+    if not coordinator.data:
+        return None
+
+    version = coordinator.refresh_state()
+    cached = coordinator.payload_cache.get(ACCOUNT_PAYLOAD)
+    if cached is None or cached[0] != version:
+        payload = serialize_player_status(coordinator.data, coordinator.values_now)
+        payload["version"] = version
+        cached = (version, payload)
+        coordinator.payload_cache[ACCOUNT_PAYLOAD] = cached
+    return cached
+
+
+def project_payload(payload: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    """按字段投影序列化数据。
+
+    字段使用点号表示嵌套路径，如 "building.drone_current"；
+    路径中途遇到 null 时结果为 null，不存在的字段将被忽略。
+
+    Args:
+        payload: 序列化数据
+        fields: 字段路径列表
+
+    Returns:
+        仅包含所选字段、保留原有嵌套结构的字典
+    """
+    result: dict[str, Any] = {}
+    for field_path in fields:
+        parts = field_path.split(".")
+        source: Any = payload
+        target = result
+        for index, part in enumerate(parts):
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+            if part in target and target[part] is source:
+                # 上层字段已被完整选取
+                break
+            if index == len(parts) - 1 or source is None:
+                target[part] = source
+                break
+            target = target.setdefault(part, {})
+    return result
+
+
+def _escape_pointer(key: Any) -> str:
+    """按 JSON Pointer 规则转义路径片段。"""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def diff_payload(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """计算两份序列化数据之间的 JSON Patch 风格增量。
+
+    字典逐键递归比较；列表与其他值发生变化时整体替换。
+
+    Args:
+        old: 旧数据
+        new: 新数据
+        path: 当前 JSON Pointer 路径
+
+    Returns:
+        操作列表，如 [{"op": "replace", "path": "/sanity/current", "value": 101}]
+    """
+    if old == new:
+        return []
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    ops: list[dict[str, Any]] = []
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": f"{path}/{_escape_pointer(key)}"})
+    for key, value in new.items():
+        child_path = f"{path}/{_escape_pointer(key)}"
+        if key not in old:
+            ops.append({"op": "add", "path": child_path, "value": value})
+        else:
+            ops.extend(diff_payload(old[key], value, child_path))
+    return ops
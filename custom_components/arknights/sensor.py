@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -17,151 +18,314 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_UID, CONF_NICKNAME
-from .coordinator import ArknightsDataUpdateCoordinator
-from .api.models import PlayerStatus
+from .const import DOMAIN, CONF_UID, CONF_NICKNAME, CONF_EXCLUDE_VOLATILE_ATTRIBUTES
+from .coordinator import ArknightsDataUpdateCoordinator, EntityValueFn
+from .api.models import PlayerStatus, BuildingInfo
 
 
-SENSOR_DESCRIPTIONS = [
-    SensorEntityDescription(
+# 频繁变化、无需写入记录器的属性
+VOLATILE_ATTRIBUTES = frozenset({"percentage", "minutes_to_full", "remaining_minutes"})
+
+
+def _percentage(current: int, total: int) -> float:
+    """计算百分比（保留一位小数）。"""
+    return round(current / max(total, 1) * 100, 1)
+
+
+def _building_value(
+    fn: Callable[[BuildingInfo], Any], default: Any = 0
+) -> Callable[[PlayerStatus, float], Any]:
+    """生成基建类传感器的取值函数（无基建数据时返回默认值）。"""
+    return lambda data, now: fn(data.building) if data.building else default
+
+
+def _building_attrs(
+    fn: Callable[[BuildingInfo], dict[str, Any]],
+) -> Callable[[PlayerStatus, float], dict[str, Any] | None]:
+    """生成基建类传感器的属性函数（无基建数据时返回 None）。"""
+    return lambda data, now: fn(data.building) if data.building else None
+
+
+def _sanity_attrs(data: PlayerStatus, now: float) -> dict[str, Any]:
+    """理智传感器额外属性。"""
+    current = data.sanity.current_at(now)
+    recovery_time = data.sanity.recovery_time
+    return {
+        "current": current,
+        "max": data.sanity.max,
+        "percentage": round(current / data.sanity.max * 100, 1),
+        "recovery_time": recovery_time.isoformat() if recovery_time else None,
+        "minutes_to_full": data.sanity.minutes_to_full_at(now),
+    }
+
+
+def _sanity_recovery_time(data: PlayerStatus, now: float) -> Any:
+    """理智完全恢复时间（已满时返回 None）。"""
+    recovery_time = data.sanity.recovery_time
+    if recovery_time is None or data.sanity.current_at(now) >= data.sanity.max:
+        return None
+    return recovery_time
+
+
+def _sanity_minutes_to_full(data: PlayerStatus, now: float) -> int:
+    """理智恢复剩余分钟。"""
+    if data.sanity.current_at(now) >= data.sanity.max:
+        return 0
+    return data.sanity.minutes_to_full_at(now)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ArknightsSensorEntityDescription(SensorEntityDescription):
+    """明日方舟传感器描述。"""
+
+    value_fn: Callable[[PlayerStatus, float], Any]
+    """状态值计算函数：(玩家数据, 当前时间戳) -> 状态值"""
+    attrs_fn: Callable[[PlayerStatus, float], dict[str, Any] | None] = (
+        lambda data, now: None
+    )
+    """额外属性计算函数：(玩家数据, 当前时间戳) -> 属性字典"""
+    time_derived: bool = False
+    """值是否随时间推算变化（由时钟刻度驱动更新，无需请求 API）"""
+
+
+SENSOR_DESCRIPTIONS: tuple[ArknightsSensorEntityDescription, ...] = (
+    ArknightsSensorEntityDescription(
         key="sanity",
         name="理智",
         icon="mdi:brain",
         native_unit_of_measurement="点",
         state_class=SensorStateClass.MEASUREMENT,
+        time_derived=True,
+        value_fn=lambda data, now: data.sanity.current_at(now),
+        attrs_fn=_sanity_attrs,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="sanity_max",
         name="最大理智",
         icon="mdi:brain",
         native_unit_of_measurement="点",
         state_class=SensorStateClass.MEASUREMENT,
         entity_registry_enabled_default=False,
+        value_fn=lambda data, now: data.sanity.max,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="sanity_recovery_time",
         name="理智恢复时间",
         icon="mdi:clock-outline",
         device_class=SensorDeviceClass.TIMESTAMP,
+        time_derived=True,
+        value_fn=_sanity_recovery_time,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="sanity_minutes_to_full",
         name="理智恢复剩余",
         icon="mdi:timer-sand",
         native_unit_of_measurement="分钟",
         state_class=SensorStateClass.MEASUREMENT,
+        time_derived=True,
+        value_fn=_sanity_minutes_to_full,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="level",
         name="等级",
         icon="mdi:account-star",
         native_unit_of_measurement="级",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data, now: data.level,
+        attrs_fn=lambda data, now: {
+            "name": data.name,
+            "uid": data.uid,
+            "register_date": data.register_date,
+            "main_stage_progress": data.main_stage_progress,
+            "resume": data.resume,
+        },
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="char_count",
         name="干员数量",
         icon="mdi:account-group",
         native_unit_of_measurement="人",
         state_class=SensorStateClass.MEASUREMENT,
         entity_registry_enabled_default=False,
+        value_fn=lambda data, now: data.char_count,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="sanity_status",
         name="理智状态",
         icon="mdi:alert-circle",
         translation_key="sanity_status",
+        time_derived=True,
+        value_fn=lambda data, now: (
+            "full" if data.sanity.current_at(now) >= data.sanity.max else "not_full"
+        ),
+        attrs_fn=lambda data, now: {
+            "sanity": data.sanity.current_at(now),
+            "max_sanity": data.sanity.max,
+        },
     ),
     # 基建传感器
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="trading_stock",
         name="贸易站库存",
         icon="mdi:package-variant",
         native_unit_of_measurement="单",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_building_value(lambda b: b.trading_stock),
+        attrs_fn=_building_attrs(lambda b: {
+            "current": b.trading_stock,
+            "limit": b.trading_stock_limit,
+            "percentage": _percentage(b.trading_stock, b.trading_stock_limit),
+        }),
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="manufacture_complete",
         name="制造站产出",
         icon="mdi:factory",
         native_unit_of_measurement="个",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_building_value(lambda b: b.manufacture_complete),
+        attrs_fn=_building_attrs(lambda b: {
+            "current": b.manufacture_complete,
+            "capacity": b.manufacture_capacity,
+            "percentage": _percentage(b.manufacture_complete, b.manufacture_capacity),
+        }),
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="drone",
         name="无人机",
         icon="mdi:quadcopter",
         native_unit_of_measurement="架",
         state_class=SensorStateClass.MEASUREMENT,
+        time_derived=True,
+        value_fn=lambda data, now: data.building.drone_at(now) if data.building else 0,
+        attrs_fn=lambda data, now: {
+            "current": data.building.drone_at(now),
+            "max": data.building.drone_max,
+            "percentage": _percentage(data.building.drone_at(now), data.building.drone_max),
+        } if data.building else None,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="training_state",
         name="训练室状态",
         icon="mdi:arm-flex",
         translation_key="training_state",
+        time_derived=True,
+        value_fn=_building_value(lambda b: b.training_state, "空闲"),
+        attrs_fn=lambda data, now: {
+            "remaining_minutes": data.building.training_remaining_minutes_at(now),
+            "trainee_char_id": data.building.trainee_char_id,
+        } if data.building else None,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="training_remaining",
         name="训练剩余时间",
         icon="mdi:timer",
         native_unit_of_measurement="分钟",
         state_class=SensorStateClass.MEASUREMENT,
         entity_registry_enabled_default=False,
+        time_derived=True,
+        value_fn=lambda data, now: (
+            data.building.training_remaining_minutes_at(now) if data.building else 0
+        ),
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="hire_refresh_count",
         name="公招刷新次数",
         icon="mdi:refresh",
         native_unit_of_measurement="次",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_building_value(lambda b: b.hire_refresh_count),
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="recruit_finished",
         name="公招完成数",
         icon="mdi:account-check",
         native_unit_of_measurement="个",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_building_value(lambda b: b.recruit_finished),
+        attrs_fn=_building_attrs(lambda b: {
+            "finished": b.recruit_finished,
+            "total": b.recruit_total,
+        }),
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="clue_collected",
         name="线索收集",
         icon="mdi:puzzle",
         native_unit_of_measurement="个",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_building_value(lambda b: b.clue_collected),
+        attrs_fn=_building_attrs(lambda b: {
+            "own": b.clue_own,
+            "received": b.clue_received,
+            "total": 7,
+            # 哪些线索已拥有
+            "board": [bool(c) for c in b.clue_board],
+        }),
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="dormitory_rested",
         name="宿舍休息完成",
         icon="mdi:bed",
         native_unit_of_measurement="人",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_building_value(lambda b: b.rested_count),
+        attrs_fn=_building_attrs(lambda b: {
+            "rested": b.rested_count,
+            "resting": b.resting_count,
+        }),
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="tired_char_count",
         name="疲劳干员",
         icon="mdi:sleep-off",
         native_unit_of_measurement="人",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_building_value(lambda b: b.tired_count),
     ),
     # 剿灭与任务
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="campaign_reward",
         name="剿灭进度",
         icon="mdi:skull-crossbones",
         native_unit_of_measurement="合成玉",
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data, now: data.campaign.current if data.campaign else 0,
+        attrs_fn=lambda data, now: {
+            "current": data.campaign.current,
+            "total": data.campaign.total,
+            "missing": data.campaign.total - data.campaign.current,
+        } if data.campaign else None,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="daily_task",
         name="日常任务",
         icon="mdi:calendar-check",
+        value_fn=lambda data, now: (
+            f"{data.routine.daily_current}/{data.routine.daily_total}"
+            if data.routine else "0/0"
+        ),
+        attrs_fn=lambda data, now: {
+            "current": data.routine.daily_current,
+            "total": data.routine.daily_total,
+            "percentage": _percentage(data.routine.daily_current, data.routine.daily_total),
+        } if data.routine else None,
     ),
-    SensorEntityDescription(
+    ArknightsSensorEntityDescription(
         key="weekly_task",
         name="周常任务",
         icon="mdi:calendar-week",
+        value_fn=lambda data, now: (
+            f"{data.routine.weekly_current}/{data.routine.weekly_total}"
+            if data.routine else "0/0"
+        ),
+        attrs_fn=lambda data, now: {
+            "current": data.routine.weekly_current,
+            "total": data.routine.weekly_total,
+            "percentage": _percentage(data.routine.weekly_current, data.routine.weekly_total),
+        } if data.routine else None,
     ),
-]
+)
 
 
 async def async_setup_entry(
@@ -173,27 +337,52 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: ArknightsDataUpdateCoordinator = data["coordinator"]
 
+    coordinator.register_entity_values(
+        {
+            description.key: _entity_value_fn(description)
+            for description in SENSOR_DESCRIPTIONS
+        },
+        time_derived={
+            description.key
+            for description in SENSOR_DESCRIPTIONS
+            if description.time_derived
+        },
+    )
+
+    sensor_cls = (
+        ArknightsUnrecordedSensor
+        if entry.options.get(CONF_EXCLUDE_VOLATILE_ATTRIBUTES, False)
+        else ArknightsSensor
+    )
     entities = [
-        ArknightsSensor(coordinator, entry, description)
+        sensor_cls(coordinator, entry, description)
         for description in SENSOR_DESCRIPTIONS
     ]
 
     async_add_entities(entities)
 
 
+def _entity_value_fn(description: ArknightsSensorEntityDescription) -> EntityValueFn:
+    """将描述中的取值函数与属性函数合并为协调器使用的计算函数。"""
+    value_fn = description.value_fn
+    attrs_fn = description.attrs_fn
+    return lambda data, now: (value_fn(data, now), attrs_fn(data, now))
+
+
 class ArknightsSensor(CoordinatorEntity[ArknightsDataUpdateCoordinator], SensorEntity):
     """明日方舟传感器实体。"""
 
     _attr_has_entity_name = True
+    entity_description: ArknightsSensorEntityDescription
 
     def __init__(
         self,
         coordinator: ArknightsDataUpdateCoordinator,
         entry: ConfigEntry,
-        description: SensorEntityDescription,
+        description: ArknightsSensorEntityDescription,
     ) -> None:
         """初始化传感器。"""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.key)
         self.entity_description = description
         self._attr_unique_id = f"{entry.data[CONF_UID]}_{description.key}"
 
@@ -211,158 +400,17 @@ class ArknightsSensor(CoordinatorEntity[ArknightsDataUpdateCoordinator], SensorE
         """获取传感器值。"""
         if not self.coordinator.data:
             return None
+        return self.coordinator.get_entity_value(self.entity_description.key)[0]
 
-        data: PlayerStatus = self.coordinator.data
-        key = self.entity_description.key
-
-        if key == "sanity":
-            return data.sanity.current_now
-        elif key == "sanity_max":
-            return data.sanity.max
-        elif key == "sanity_recovery_time":
-            recovery_time = data.sanity.recovery_time
-            # 如果已满，返回 None
-            if recovery_time is None or data.sanity.current_now >= data.sanity.max:
-                return None
-            return recovery_time
-        elif key == "sanity_minutes_to_full":
-            if data.sanity.current_now >= data.sanity.max:
-                return 0
-            return data.sanity.minutes_to_full
-        elif key == "level":
-            return data.level
-        elif key == "char_count":
-            return data.char_count
-        elif key == "sanity_status":
-            if data.sanity.current_now >= data.sanity.max:
-                return "full"
-            return "not_full"
-        # 基建传感器
-        elif key == "trading_stock":
-            return data.building.trading_stock if data.building else 0
-        elif key == "manufacture_complete":
-            return data.building.manufacture_complete if data.building else 0
-        elif key == "drone":
-            return data.building.drone_current if data.building else 0
-        elif key == "training_state":
-            return data.building.training_state if data.building else "空闲"
-        elif key == "training_remaining":
-            return data.building.training_remaining_minutes if data.building else 0
-        elif key == "hire_refresh_count":
-            return data.building.hire_refresh_count if data.building else 0
-        elif key == "recruit_finished":
-            return data.building.recruit_finished if data.building else 0
-        elif key == "clue_collected":
-            return data.building.clue_collected if data.building else 0
-        elif key == "dormitory_rested":
-            return data.building.rested_count if data.building else 0
-        elif key == "tired_char_count":
-            return data.building.tired_count if data.building else 0
-
-        # 剿灭与任务
-        elif key == "campaign_reward":
-            return data.campaign.current if data.campaign else 0
-        elif key == "daily_task":
-            if data.routine:
-                return f"{data.routine.daily_current}/{data.routine.daily_total}"
-            return "0/0"
-        elif key == "weekly_task":
-            if data.routine:
-                return f"{data.routine.weekly_current}/{data.routine.weekly_total}"
-            return "0/0"
-
-        return None
-    
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """额外状态属性。"""
         if not self.coordinator.data:
             return None
+        return self.coordinator.get_entity_value(self.entity_description.key)[1]
 
-        data: PlayerStatus = self.coordinator.data
-        key = self.entity_description.key
-
-        if key == "sanity":
-            return {
-                "current": data.sanity.current_now,
-                "max": data.sanity.max,
-                "percentage": round(data.sanity.current_now / data.sanity.max * 100, 1),
-                "recovery_time": data.sanity.recovery_time.isoformat() if data.sanity.recovery_time else None,
-                "minutes_to_full": data.sanity.minutes_to_full,
-            }
-        elif key == "level":
-            return {
-                "name": data.name,
-                "uid": data.uid,
-                "register_date": data.register_date,
-                "main_stage_progress": data.main_stage_progress,
-                "resume": data.resume,
-            }
-        elif key == "sanity_status":
-            return {
-                "sanity": data.sanity.current_now,
-                "max_sanity": data.sanity.max,
-            }
-        # 基建传感器额外属性
-        elif key == "trading_stock" and data.building:
-            return {
-                "current": data.building.trading_stock,
-                "limit": data.building.trading_stock_limit,
-                "percentage": round(data.building.trading_stock / max(data.building.trading_stock_limit, 1) * 100, 1),
-            }
-        elif key == "manufacture_complete" and data.building:
-            return {
-                "current": data.building.manufacture_complete,
-                "capacity": data.building.manufacture_capacity,
-                "percentage": round(data.building.manufacture_complete / max(data.building.manufacture_capacity, 1) * 100, 1),
-            }
-        elif key == "drone" and data.building:
-            return {
-                "current": data.building.drone_current,
-                "max": data.building.drone_max,
-                "percentage": round(data.building.drone_current / max(data.building.drone_max, 1) * 100, 1),
-            }
-        elif key == "training_state" and data.building:
-            return {
-                "remaining_minutes": data.building.training_remaining_minutes,
-                "trainee_char_id": data.building.trainee_char_id,
-            }
-        elif key == "recruit_finished" and data.building:
-            return {
-                "finished": data.building.recruit_finished,
-                "total": data.building.recruit_total,
-            }
-        elif key == "clue_collected" and data.building:
-            return {
-                "own": data.building.clue_own,
-                "received": data.building.clue_received,
-                "total": 7,
-                # 哪些线索已拥有
-                "board": [bool(c) for c in data.building.clue_board],
-            }
-        elif key == "dormitory_rested" and data.building:
-            return {
-                "rested": data.building.rested_count,
-                "resting": data.building.resting_count,
-            }
-        # 剿灭与任务额外属性
-        elif key == "campaign_reward" and data.campaign:
-            return {
-                "current": data.campaign.current,
-                "total": data.campaign.total,
-                "missing": data.campaign.total - data.campaign.current,
-            }
-        elif key == "daily_task" and data.routine:
-            return {
-                "current": data.routine.daily_current,
-                "total": data.routine.daily_total,
-                "percentage": round(data.routine.daily_current / max(data.routine.daily_total, 1) * 100, 1),
-            }
-        elif key == "weekly_task" and data.routine:
-            return {
-                "current": data.routine.weekly_current,
-                "total": data.routine.weekly_total,
-                "percentage": round(data.routine.weekly_current / max(data.routine.weekly_total, 1) * 100, 1),
-            }
 
-        return None
+class ArknightsUnrecordedSensor(ArknightsSensor):
+    """不向记录器写入易变属性的明日方舟传感器实体。"""
+
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
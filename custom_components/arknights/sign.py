@@ -0,0 +1,225 @@
+"""明日方舟批量签到与每日自动签到。
+
+不同凭证下的角色并发签到（受并发上限约束），
+同一凭证下的角色按顺序签到，结果汇总为一条通知。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DOMAIN,
+    CONF_TOKEN,
+    CONF_UID,
+    CONF_AUTO_SIGN,
+    CONF_AUTO_SIGN_DELAY,
+    CONF_AUTO_SIGN_WINDOW,
+    AUTO_SIGN_CHECK_INTERVAL,
+    AUTO_SIGN_RETRY_BASE,
+    AUTO_SIGN_RETRY_MAX,
+    DEFAULT_AUTO_SIGN_DELAY,
+    DEFAULT_AUTO_SIGN_WINDOW,
+    DATA_SIGN_SCHEDULER,
+    SIGN_MAX_CONCURRENCY,
+)
+from .api.clock import game_day, game_day_start
+from .attendance import AttendanceLedger, async_get_attendance_ledger
+
+_LOGGER = logging.getLogger(__name__)
+
+SIGN_SUMMARY_NOTIFICATION_ID = f"{DOMAIN}_sign_summary"
+AUTO_SIGN_NOTIFICATION_ID = f"{DOMAIN}_auto_sign"
+
+
+async def async_sign_entries(
+    hass: HomeAssistant,
+    entry_ids: list[str],
+    max_concurrency: int = SIGN_MAX_CONCURRENCY,
+) -> dict[str, dict[str, Any]]:
+    """为多个配置条目执行签到。
+
+    Args:
+        hass: Home Assistant 实例
+        entry_ids: 配置条目 ID 列表（未加载的条目会被忽略）
+        max_concurrency: 同时进行的签到请求数上限
+
+    Returns:
+        配置条目 ID -> 签到结果
+    """
+    # 按原始 token 分组：同一凭证内串行，不同凭证之间并发
+    groups: dict[str, list[str]] = {}
+    for entry_id in entry_ids:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is None or entry_id not in hass.data.get(DOMAIN, {}):
+            continue
+        groups.setdefault(entry.data[CONF_TOKEN], []).append(entry_id)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    results: dict[str, dict[str, Any]] = {}
+
+    async def _async_sign_group(group: list[str]) -> None:
+        for entry_id in group:
+            data = hass.data[DOMAIN].get(entry_id)
+            if data is None:
+                continue
+            coordinator = data["coordinator"]
+            async with semaphore:
+                result = await coordinator.async_sign(data["channel_master_id"])
+            _LOGGER.info("签到结果 [%s]: %s", coordinator.nickname, result["message"])
+            results[entry_id] = result
+
+    await asyncio.gather(*(_async_sign_group(group) for group in groups.values()))
+    return results
+
+
+def format_sign_summary(hass: HomeAssistant, results: dict[str, dict[str, Any]]) -> str:
+    """将签到结果汇总为通知文本。"""
+    succeeded = sum(1 for result in results.values() if result["success"])
+    lines = [f"成功 {succeeded} / 共 {len(results)}"]
+    for entry_id, result in results.items():
+        data = hass.data[DOMAIN].get(entry_id)
+        nickname = data["coordinator"].nickname if data else entry_id
+        lines.append(f"- {nickname}: {result['message']}")
+    return "\n".join(lines)
+
+
+class ArknightsSignScheduler:
+    """每日自动签到调度器。
+
+    每个启用自动签到的角色在每个游戏日签到一次：签到时刻为游戏日开始后
+    的延迟加上时间窗口内的随机偏移（按角色与日期确定，重启后保持不变），
+    使各角色的签到分散开。每日完成情况以签到记录为准，重启后不会重复签到；
+    失败时按指数退避重试，直到游戏日结束。
+    """
+
+    def __init__(self, hass: HomeAssistant, attendance: AttendanceLedger) -> None:
+        """初始化调度器。"""
+        self.hass = hass
+        self._attendance = attendance
+        # UID -> (游戏日, 失败次数, 下次重试时间戳)
+        self._retries: dict[str, tuple[str, int, float]] = {}
+        self._entry_ids: set[str] = set()
+        self._unsub: CALLBACK_TYPE | None = None
+        self._running = False
+
+    @callback
+    def async_add_entry(self, entry_id: str) -> CALLBACK_TYPE:
+        """加入配置条目（是否自动签到以条目选项为准）。
+
+        Returns:
+            移除该条目的回调
+        """
+        self._entry_ids.add(entry_id)
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_check, AUTO_SIGN_CHECK_INTERVAL
+            )
+
+        @callback
+        def _remove() -> None:
+            self._entry_ids.discard(entry_id)
+            if not self._entry_ids and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _remove
+
+    @staticmethod
+    def due_at(options: dict[str, Any], uid: str, timestamp: float) -> float:
+        """计算角色在指定时间所在游戏日的计划签到时间。
+
+        Args:
+            options: 配置条目选项
+            uid: 角色 UID
+            timestamp: Unix 时间戳（秒）
+
+        Returns:
+            计划签到的 Unix 时间戳
+        """
+        delay = options.get(CONF_AUTO_SIGN_DELAY, DEFAULT_AUTO_SIGN_DELAY) * 60
+        window = options.get(CONF_AUTO_SIGN_WINDOW, DEFAULT_AUTO_SIGN_WINDOW) * 60
+        jitter = random.Random(f"{uid}:{game_day(timestamp)}").uniform(0, window)
+        return game_day_start(timestamp) + delay + jitter
+
+    @callback
+    def _async_check(self, now: datetime) -> None:
+        """检查到期的角色并在后台签到。"""
+        if self._running:
+            return
+
+        timestamp = now.timestamp()
+        day = game_day(timestamp)
+        due: list[str] = []
+        for entry_id in self._entry_ids:
+            entry = self.hass.config_entries.async_get_entry(entry_id)
+            if entry is None or not entry.options.get(CONF_AUTO_SIGN, False):
+                continue
+            uid = entry.data[CONF_UID]
+            if self._attendance.get(uid, day) is not None:
+                continue
+            retry_day, _, retry_at = self._retries.get(uid, (day, 0, 0.0))
+            if retry_day == day and timestamp < retry_at:
+                continue
+            if timestamp < self.due_at(entry.options, uid, timestamp):
+                continue
+            due.append(entry_id)
+
+        if due:
+            self._running = True
+            self.hass.async_create_background_task(
+                self._async_sign(due, day, timestamp), f"{DOMAIN}_auto_sign"
+            )
+
+    async def _async_sign(self, entry_ids: list[str], day: str, timestamp: float) -> None:
+        """为到期的角色签到并记录结果。"""
+        from homeassistant.components import persistent_notification
+
+        try:
+            results = await async_sign_entries(self.hass, entry_ids)
+            for entry_id, result in results.items():
+                entry = self.hass.config_entries.async_get_entry(entry_id)
+                if entry is None:
+                    continue
+                uid = entry.data[CONF_UID]
+                if result["success"]:
+                    self._retries.pop(uid, None)
+                    continue
+
+                retry_day, attempts, _ = self._retries.get(uid, (day, 0, 0.0))
+                attempts = attempts + 1 if retry_day == day else 1
+                backoff = min(
+                    AUTO_SIGN_RETRY_BASE * 2 ** (attempts - 1), AUTO_SIGN_RETRY_MAX
+                )
+                self._retries[uid] = (day, attempts, timestamp + backoff.total_seconds())
+                _LOGGER.warning(
+                    "自动签到失败 [%s]，%d 分钟后重试: %s",
+                    uid,
+                    backoff.total_seconds() // 60,
+                    result["message"],
+                )
+
+            if results:
+                persistent_notification.async_create(
+                    self.hass,
+                    format_sign_summary(self.hass, results),
+                    title="明日方舟自动签到结果",
+                    notification_id=AUTO_SIGN_NOTIFICATION_ID,
+                )
+        finally:
+            self._running = False
+
+
+async def async_get_sign_scheduler(hass: HomeAssistant) -> ArknightsSignScheduler:
+    """获取（必要时创建并加载）集成共用的自动签到调度器。"""
+    if DATA_SIGN_SCHEDULER not in hass.data:
+        attendance = await async_get_attendance_ledger(hass)
+        hass.data.setdefault(DATA_SIGN_SCHEDULER, ArknightsSignScheduler(hass, attendance))
+    return hass.data[DATA_SIGN_SCHEDULER]
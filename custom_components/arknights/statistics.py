@@ -0,0 +1,156 @@
+"""明日方舟长期统计导入。
+
+基于集成自有的时间序列存储，每小时将各指标的均值/最小值/最大值
+直接写入 Home Assistant 长期统计（外部统计），
+高频变化的传感器因此可以排除在记录器之外而不丢失图表。
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+
+from .const import DOMAIN, STATISTICS_IMPORT_MINUTE, TIMESERIES_RETENTION
+from .coordinator import ArknightsDataUpdateCoordinator
+from .history import Point
+from .sensor import SENSOR_DESCRIPTIONS
+from .timeseries import TIMESERIES_METRICS, AccountTimeSeriesStore
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+_UNITS = {
+    description.key: description.native_unit_of_measurement
+    for description in SENSOR_DESCRIPTIONS
+}
+
+
+def statistic_id(uid: str, metric: str) -> str:
+    """外部统计 ID。"""
+    return f"{DOMAIN}:{uid}_{metric}"
+
+
+def hourly_aggregates(points: list[Point]) -> list[tuple[int, float, float, float]]:
+    """按整点小时聚合数据点。
+
+    Args:
+        points: 按时间升序排列的数据点
+
+    Returns:
+        [(小时起始时间戳, 均值, 最小值, 最大值), ...]
+    """
+    result: list[tuple[int, float, float, float]] = []
+    bucket: list[float] = []
+    bucket_start: int | None = None
+
+    for timestamp, value in points:
+        hour = int(timestamp // HOUR) * HOUR
+        if hour != bucket_start:
+            if bucket:
+                result.append(
+                    (bucket_start, sum(bucket) / len(bucket), min(bucket), max(bucket))
+                )
+            bucket, bucket_start = [], hour
+        bucket.append(value)
+
+    if bucket:
+        result.append((bucket_start, sum(bucket) / len(bucket), min(bucket), max(bucket)))
+    return result
+
+
+def _start_timestamp(start: Any) -> float:
+    """兼容不同版本记录器返回的统计起始时间（时间戳或 datetime）。"""
+    if isinstance(start, datetime):
+        return start.timestamp()
+    return float(start)
+
+
+async def async_import_statistics(
+    hass: HomeAssistant,
+    coordinator: ArknightsDataUpdateCoordinator,
+    store: AccountTimeSeriesStore,
+) -> None:
+    """将上次导入之后已结束的整点小时聚合写入长期统计。"""
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.models import (
+        StatisticData,
+        StatisticMetaData,
+    )
+    from homeassistant.components.recorder.statistics import (
+        async_add_external_statistics,
+        get_last_statistics,
+    )
+
+    # 当前小时尚未结束，只导入此前的小时
+    end_hour = int(coordinator.clock() // HOUR) * HOUR
+
+    for metric in TIMESERIES_METRICS:
+        stat_id = statistic_id(coordinator.uid, metric)
+        last = await get_instance(hass).async_add_executor_job(
+            get_last_statistics, hass, 1, stat_id, True, {"mean"}
+        )
+        if last.get(stat_id):
+            start = _start_timestamp(last[stat_id][0]["start"]) + HOUR
+        else:
+            start = end_hour - TIMESERIES_RETENTION.total_seconds()
+        if start >= end_hour:
+            continue
+
+        points = await store.async_read(metric, start, end_hour - 1)
+        aggregates = hourly_aggregates(points)
+        if not aggregates:
+            continue
+
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"{coordinator.nickname} {metric}",
+            source=DOMAIN,
+            statistic_id=stat_id,
+            unit_of_measurement=_UNITS.get(metric),
+        )
+        statistics = [
+            StatisticData(
+                start=datetime.fromtimestamp(hour, tz=timezone.utc),
+                mean=mean,
+                min=low,
+                max=high,
+            )
+            for hour, mean, low, high in aggregates
+        ]
+        async_add_external_statistics(hass, metadata, statistics)
+        _LOGGER.debug("已导入长期统计 %s: %d 小时", stat_id, len(statistics))
+
+
+@callback
+def async_setup_statistics(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: ArknightsDataUpdateCoordinator,
+    store: AccountTimeSeriesStore,
+) -> None:
+    """启用长期统计导入：启动时补齐一次，之后每小时导入一次。"""
+    if "recorder" not in hass.config.components:
+        _LOGGER.debug("记录器未启用，跳过长期统计导入")
+        return
+
+    @callback
+    def _async_schedule_import(*_: Any) -> None:
+        entry.async_create_background_task(
+            hass,
+            async_import_statistics(hass, coordinator, store),
+            f"{coordinator.name}_import_statistics",
+        )
+
+    entry.async_on_unload(
+        async_track_time_change(
+            hass, _async_schedule_import, minute=STATISTICS_IMPORT_MINUTE, second=0
+        )
+    )
+    _async_schedule_import()
@@ -0,0 +1,74 @@
+"""明日方舟时钟刻度。
+
+整个集成共用一个定时器，按固定粒度驱动所有协调器重新推算
+理智、剩余时间等时间相关的实体值，而无需请求 API。
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import CLOCK_TICK_INTERVAL, DATA_CLOCK_TICKER
+from .coordinator import ArknightsDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ArknightsClockTicker:
+    """集成级时钟刻度。
+
+    第一个协调器加入时启动定时器，最后一个协调器移除时停止。
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """初始化时钟刻度。"""
+        self.hass = hass
+        self._coordinators: set[ArknightsDataUpdateCoordinator] = set()
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_coordinator(
+        self, coordinator: ArknightsDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """加入协调器。
+
+        Returns:
+            移除该协调器的回调
+        """
+        self._coordinators.add(coordinator)
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_tick, CLOCK_TICK_INTERVAL
+            )
+            _LOGGER.debug("时钟刻度已启动")
+
+        @callback
+        def _remove() -> None:
+            self._coordinators.discard(coordinator)
+            if not self._coordinators and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+                _LOGGER.debug("时钟刻度已停止")
+
+        return _remove
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """驱动所有协调器推算时间相关的实体值。
+
+        各协调器使用自身注入的时钟取时间快照。
+        """
+        for coordinator in list(self._coordinators):
+            coordinator.async_tick()
+
+
+@callback
+def async_get_clock_ticker(hass: HomeAssistant) -> ArknightsClockTicker:
+    """获取（必要时创建）集成共用的时钟刻度。"""
+    if DATA_CLOCK_TICKER not in hass.data:
+        hass.data[DATA_CLOCK_TICKER] = ArknightsClockTicker(hass)
+    return hass.data[DATA_CLOCK_TICKER]
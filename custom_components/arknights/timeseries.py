@@ -0,0 +1,410 @@
+"""明日方舟账号时间序列存储。
+
+集成自有的追加式存储，按账号记录理智、无人机、贸易站库存等指标：
+
+- 每个数据块文件按列存储，时间戳与各指标均做差分编码后以定长数组写入；
+- 新数据先缓存在内存中，满一块或间隔一定时间后写出为新的数据块文件，
+  已写出的文件不再修改；
+- 小数据块会被合并（压缩），超过保留期的数据块会被删除；
+- 读取时对数据块文件做内存映射，只解码所需的列。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import sys
+from array import array
+from collections.abc import Callable
+from itertools import accumulate
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .api.models import PlayerStatus
+from .const import (
+    TIMESERIES_DIR,
+    TIMESERIES_CHUNK_SIZE,
+    TIMESERIES_FLUSH_INTERVAL,
+    TIMESERIES_RETENTION,
+)
+from .coordinator import ArknightsDataUpdateCoordinator
+from .history import Point
+
+_LOGGER = logging.getLogger(__name__)
+
+# 数据块文件格式：头部 | 指标名 JSON | 时间戳差分列 (int64) | 各指标差分列 (int32)
+CHUNK_MAGIC = b"AKTS"
+CHUNK_FORMAT_VERSION = 1
+CHUNK_SUFFIX = ".akts"
+_HEADER = struct.Struct("<4sBxHI")  # magic, version, 指标名长度, 样本数
+_TS_TYPE = "q"
+_VALUE_TYPE = "i"
+
+
+def _building_metric(fn: Callable) -> Callable[[PlayerStatus, float], int]:
+    """生成基建类指标的取值函数（无基建数据时为 0）。"""
+    return lambda data, now: fn(data.building, now) if data.building else 0
+
+
+TIMESERIES_METRICS: dict[str, Callable[[PlayerStatus, float], int]] = {
+    "sanity": lambda data, now: data.sanity.current_at(now),
+    "sanity_max": lambda data, now: data.sanity.max,
+    "level": lambda data, now: data.level,
+    "char_count": lambda data, now: data.char_count,
+    "trading_stock": _building_metric(lambda b, now: b.trading_stock),
+    "manufacture_complete": _building_metric(lambda b, now: b.manufacture_complete),
+    "drone": _building_metric(lambda b, now: b.drone_at(now)),
+    "hire_refresh_count": _building_metric(lambda b, now: b.hire_refresh_count),
+    "recruit_finished": _building_metric(lambda b, now: b.recruit_finished),
+    "clue_collected": _building_metric(lambda b, now: b.clue_collected),
+    "dormitory_rested": _building_metric(lambda b, now: b.rested_count),
+    "tired_char_count": _building_metric(lambda b, now: b.tired_count),
+    "campaign_reward": lambda data, now: data.campaign.current if data.campaign else 0,
+    "daily_task": lambda data, now: data.routine.daily_current if data.routine else 0,
+    "weekly_task": lambda data, now: data.routine.weekly_current if data.routine else 0,
+}
+"""指标名（与传感器 key 一致） -> 取值函数"""
+
+
+def _delta_encode(typecode: str, values: list[int]) -> bytes:
+    """差分编码为小端字节序的定长数组。"""
+    deltas = array(typecode, (cur - prev for prev, cur in zip([0, *values], values)))
+    if sys.byteorder == "big":
+        deltas.byteswap()
+    return deltas.tobytes()
+
+
+def _delta_decode(typecode: str, buf: bytes) -> list[int]:
+    """解码差分编码的定长数组。"""
+    deltas = array(typecode)
+    deltas.frombytes(buf)
+    if sys.byteorder == "big":
+        deltas.byteswap()
+    return list(accumulate(deltas))
+
+
+def _encode_chunk(
+    names: list[str], timestamps: list[int], columns: list[list[int]]
+) -> bytes:
+    """编码数据块。"""
+    names_bytes = json.dumps(names, separators=(",", ":")).encode("utf-8")
+    parts = [
+        _HEADER.pack(CHUNK_MAGIC, CHUNK_FORMAT_VERSION, len(names_bytes), len(timestamps)),
+        names_bytes,
+        _delta_encode(_TS_TYPE, timestamps),
+    ]
+    parts.extend(_delta_encode(_VALUE_TYPE, column) for column in columns)
+    return b"".join(parts)
+
+
+def _read_header(buf) -> tuple[list[str], int, int]:
+    """解析数据块头部。
+
+    Returns:
+        (指标名列表, 样本数, 时间戳列起始偏移)
+
+    Raises:
+        ValueError: 文件格式无效
+    """
+    magic, version, names_len, count = _HEADER.unpack_from(buf, 0)
+    if magic != CHUNK_MAGIC or version != CHUNK_FORMAT_VERSION:
+        raise ValueError("无效的数据块文件")
+    names_start = _HEADER.size
+    names = json.loads(bytes(buf[names_start:names_start + names_len]))
+    return names, count, names_start + names_len
+
+
+def _decode_columns(
+    buf, metrics: list[str] | None = None
+) -> tuple[list[str], list[int], dict[str, list[int]]]:
+    """解码数据块的时间戳列与指定指标列。
+
+    Args:
+        buf: 数据块内容（bytes 或 mmap）
+        metrics: 需要解码的指标，None 表示全部
+
+    Returns:
+        (指标名列表, 时间戳列表, 指标名 -> 数值列表)
+    """
+    names, count, offset = _read_header(buf)
+    ts_size = count * array(_TS_TYPE).itemsize
+    value_size = count * array(_VALUE_TYPE).itemsize
+    timestamps = _delta_decode(_TS_TYPE, buf[offset:offset + ts_size])
+
+    columns: dict[str, list[int]] = {}
+    column_start = offset + ts_size
+    for index, name in enumerate(names):
+        if metrics is not None and name not in metrics:
+            continue
+        start = column_start + index * value_size
+        columns[name] = _delta_decode(_VALUE_TYPE, buf[start:start + value_size])
+    return names, timestamps, columns
+
+
+def _chunk_range(filename: str) -> tuple[int, int]:
+    """从文件名解析数据块的时间范围。"""
+    first, last = filename[: -len(CHUNK_SUFFIX)].split("-")
+    return int(first), int(last)
+
+
+class AccountTimeSeriesStore:
+    """单个账号的时间序列存储。"""
+
+    def __init__(self, hass: HomeAssistant, uid: str) -> None:
+        """初始化存储。
+
+        Args:
+            hass: Home Assistant 实例
+            uid: 角色 UID
+        """
+        self.hass = hass
+        self.uid = uid
+        self.path = hass.config.path(".storage", TIMESERIES_DIR, uid)
+        self._names = list(TIMESERIES_METRICS)
+        self._timestamps: list[int] = []
+        self._columns: list[list[int]] = [[] for _ in self._names]
+        self._last_flush: float | None = None
+        # 已追加（包括已写出）的最新样本时间戳，None 表示尚未从磁盘读取
+        self._last_timestamp: int | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_append(self, data: PlayerStatus, now: float) -> None:
+        """追加一条样本，必要时写出数据块。
+
+        Args:
+            data: 玩家数据
+            now: 样本时间戳
+        """
+        timestamp = int(now)
+        if self._last_timestamp is None:
+            self._last_timestamp = await self.hass.async_add_executor_job(
+                self._last_persisted_timestamp
+            )
+        if timestamp <= self._last_timestamp:
+            return
+
+        self._last_timestamp = timestamp
+        self._timestamps.append(timestamp)
+        for column, name in zip(self._columns, self._names):
+            column.append(int(TIMESERIES_METRICS[name](data, now)))
+
+        if self._last_flush is None:
+            self._last_flush = now
+        if (
+            len(self._timestamps) >= TIMESERIES_CHUNK_SIZE
+            or now - self._last_flush >= TIMESERIES_FLUSH_INTERVAL.total_seconds()
+        ):
+            await self.async_flush(now)
+
+    async def async_flush(self, now: float | None = None) -> None:
+        """将内存中的样本写出为新数据块，并执行压缩与保留期清理。
+
+        Args:
+            now: 当前时间戳（用于保留期计算，为空则跳过清理）
+        """
+        cutoff = None
+        if now is not None:
+            cutoff = int(now - TIMESERIES_RETENTION.total_seconds())
+
+        async with self._lock:
+            if not self._timestamps:
+                return
+
+            timestamps, columns = self._timestamps, self._columns
+            self._timestamps = []
+            self._columns = [[] for _ in self._names]
+            self._last_flush = now
+
+            await self.hass.async_add_executor_job(
+                self._write_and_maintain, timestamps, columns, cutoff
+            )
+
+    async def async_read(self, metric: str, start: float, end: float) -> list[Point]:
+        """读取指定指标在时间范围内的数据点。
+
+        Args:
+            metric: 指标名
+            start: 起始时间戳
+            end: 结束时间戳
+
+        Returns:
+            按时间升序排列的数据点
+        """
+        async with self._lock:
+            # 持有锁时不会写出数据块，内存样本与数据块文件互不重叠
+            buffered: list[Point] = []
+            if metric in self._names:
+                column = self._columns[self._names.index(metric)]
+                buffered = [
+                    (float(ts), float(value))
+                    for ts, value in zip(self._timestamps, column)
+                    if start <= ts <= end
+                ]
+            points = await self.hass.async_add_executor_job(
+                self._read_files, metric, start, end
+            )
+
+        points.extend(buffered)
+        return points
+
+    async def async_remove(self) -> None:
+        """删除该账号的全部数据。"""
+        async with self._lock:
+            self._timestamps = []
+            self._columns = [[] for _ in self._names]
+            self._last_timestamp = None
+            await self.hass.async_add_executor_job(
+                shutil.rmtree, self.path, True
+            )
+
+    def _list_chunks(self) -> list[str]:
+        """按时间顺序列出数据块文件名。"""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(f for f in os.listdir(self.path) if f.endswith(CHUNK_SUFFIX))
+
+    def _last_persisted_timestamp(self) -> int:
+        """获取已写出的最新样本时间戳（无数据块时为 -1）。"""
+        return max(
+            (_chunk_range(filename)[1] for filename in self._list_chunks()),
+            default=-1,
+        )
+
+    def _write_chunk(
+        self, names: list[str], timestamps: list[int], columns: list[list[int]]
+    ) -> str:
+        """原子地写出一个数据块文件。"""
+        os.makedirs(self.path, exist_ok=True)
+        filename = f"{timestamps[0]:012d}-{timestamps[-1]:012d}{CHUNK_SUFFIX}"
+        target = os.path.join(self.path, filename)
+        tmp = f"{target}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(_encode_chunk(names, timestamps, columns))
+        os.replace(tmp, target)
+        return filename
+
+    def _write_and_maintain(
+        self, timestamps: list[int], columns: list[list[int]], cutoff: int | None
+    ) -> None:
+        """写出数据块并执行保留期清理与压缩（在执行器中运行）。"""
+        self._write_chunk(self._names, timestamps, columns)
+        if cutoff is not None:
+            self._apply_retention(cutoff)
+        self._compact()
+
+    def _apply_retention(self, cutoff: int) -> None:
+        """删除全部样本都早于 cutoff 的数据块。"""
+        for filename in self._list_chunks():
+            _, last = _chunk_range(filename)
+            if last < cutoff:
+                os.remove(os.path.join(self.path, filename))
+
+    def _compact(self) -> None:
+        """将相邻的小数据块合并为接近满块大小的数据块。"""
+        group: list[tuple[str, list[str], int]] = []
+        group_count = 0
+
+        for filename in self._list_chunks():
+            with open(os.path.join(self.path, filename), "rb") as file:
+                try:
+                    names, count, _ = _read_header(file.read(_HEADER.size + 4096))
+                except (ValueError, struct.error, json.JSONDecodeError):
+                    _LOGGER.warning("跳过无效的数据块文件: %s", filename)
+                    continue
+
+            same_layout = not group or group[0][1] == names
+            if count >= TIMESERIES_CHUNK_SIZE or not same_layout or (
+                group_count + count > TIMESERIES_CHUNK_SIZE
+            ):
+                self._merge(group)
+                group, group_count = [], 0
+            if count < TIMESERIES_CHUNK_SIZE:
+                group.append((filename, names, count))
+                group_count += count
+        self._merge(group)
+
+    def _merge(self, group: list[tuple[str, list[str], int]]) -> None:
+        """合并一组数据块文件。"""
+        if len(group) < 2:
+            return
+
+        names = group[0][1]
+        timestamps: list[int] = []
+        columns: list[list[int]] = [[] for _ in names]
+        for filename, _, _ in group:
+            with open(os.path.join(self.path, filename), "rb") as file:
+                _, chunk_ts, chunk_columns = _decode_columns(file.read())
+            timestamps.extend(chunk_ts)
+            for column, name in zip(columns, names):
+                column.extend(chunk_columns[name])
+
+        merged = self._write_chunk(names, timestamps, columns)
+        for filename, _, _ in group:
+            if filename != merged:
+                os.remove(os.path.join(self.path, filename))
+
+    def _read_files(self, metric: str, start: float, end: float) -> list[Point]:
+        """通过内存映射读取数据块中的指定指标（在执行器中运行）。"""
+        points: list[Point] = []
+        for filename in self._list_chunks():
+            first, last = _chunk_range(filename)
+            if last < start or first > end:
+                continue
+
+            with open(os.path.join(self.path, filename), "rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as buf:
+                _, timestamps, columns = _decode_columns(buf, [metric])
+
+            values = columns.get(metric)
+            if values is None:
+                continue
+            points.extend(
+                (float(ts), float(value))
+                for ts, value in zip(timestamps, values)
+                if start <= ts <= end
+            )
+        return points
+
+
+@callback
+def async_track_coordinator(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: ArknightsDataUpdateCoordinator,
+) -> AccountTimeSeriesStore:
+    """为协调器创建时间序列存储，每次获得新数据时追加一条样本。
+
+    Returns:
+        账号的时间序列存储
+    """
+    store = AccountTimeSeriesStore(hass, coordinator.uid)
+    last_version = coordinator.data_version
+
+    @callback
+    def _async_record() -> None:
+        nonlocal last_version
+        if coordinator.data is None or coordinator.data_version == last_version:
+            return
+        last_version = coordinator.data_version
+        entry.async_create_background_task(
+            hass,
+            store.async_append(coordinator.data, coordinator.clock()),
+            f"{coordinator.name}_timeseries_append",
+        )
+
+    async def _async_flush_on_stop(event: Event) -> None:
+        await store.async_flush()
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_record))
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_on_stop)
+    )
+    return store
@@ -0,0 +1,192 @@
+"""明日方舟数据变化事件流。
+
+将协调器的数据更新转换为按类别划分的变化事件（理智、基建、干员等），
+通过异步迭代器逐个产出，供自动化、WebSocket、导出等统一消费。
+
+监听回调不能阻塞，因此事件先进入有界的待处理缓冲：同一账号同一类别
+尚未被消费的事件会合并为一个（保留最新值，合并变化路径），
+缓冲已满时丢弃最旧的事件。消费较慢时只会看到合并后的最新状态。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import UPDATES_MAX_PENDING
+from .payload import diff_payload, get_account_payload
+
+if TYPE_CHECKING:
+    from .coordinator import ArknightsDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# 序列化数据的顶层字段 -> 事件类别
+EVENT_CATEGORIES: dict[str, str] = {
+    "sanity": "sanity",
+    "building": "building",
+    "assist_chars": "roster",
+    "char_count": "roster",
+    "skin_count": "roster",
+    "furniture_count": "roster",
+    "medal_count": "roster",
+    "campaign": "progress",
+    "routine": "progress",
+    "tower": "progress",
+    "main_stage_progress": "progress",
+}
+DEFAULT_CATEGORY = "profile"
+"""未列出的顶层字段（昵称、等级、头像等）所属类别"""
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """账号数据变化事件。"""
+
+    uid: str
+    """角色 UID"""
+    category: str
+    """类别：sanity / building / roster / progress / profile"""
+    version: int
+    """产生该事件的协调器状态版本"""
+    changes: tuple[dict[str, Any], ...]
+    """JSON Patch 风格的变化（路径相对于完整账号数据）"""
+    value: dict[str, Any]
+    """该类别下各顶层字段的当前值"""
+
+
+def _category(path: str) -> str | None:
+    """获取变化路径所属的类别（版本号字段返回 None）。"""
+    key = path.split("/", 2)[1] if path else ""
+    if key == "version":
+        return None
+    return EVENT_CATEGORIES.get(key, DEFAULT_CATEGORY)
+
+
+def build_change_events(
+    uid: str, version: int, old: dict[str, Any] | None, new: dict[str, Any]
+) -> list[ChangeEvent]:
+    """根据两份序列化数据生成按类别划分的变化事件。
+
+    Args:
+        uid: 角色 UID
+        version: 新数据的状态版本
+        old: 旧数据（为 None 时视为全部新增）
+        new: 新数据
+
+    Returns:
+        变化事件列表（每个类别至多一个）
+    """
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for op in diff_payload(old or {}, new):
+        category = _category(op["path"])
+        if category is not None:
+            grouped.setdefault(category, []).append(op)
+
+    return [
+        ChangeEvent(
+            uid=uid,
+            category=category,
+            version=version,
+            changes=tuple(ops),
+            value={
+                key: value
+                for key, value in new.items()
+                if key != "version"
+                and EVENT_CATEGORIES.get(key, DEFAULT_CATEGORY) == category
+            },
+        )
+        for category, ops in grouped.items()
+    ]
+
+
+def _merge(pending: ChangeEvent, event: ChangeEvent) -> ChangeEvent:
+    """合并同一账号同一类别的两个事件，同一路径只保留最新的操作。"""
+    changes: dict[str, dict[str, Any]] = {op["path"]: op for op in pending.changes}
+    for op in event.changes:
+        # 先移除再插入，保证操作顺序与发生顺序一致
+        changes.pop(op["path"], None)
+        changes[op["path"]] = op
+    return ChangeEvent(
+        uid=event.uid,
+        category=event.category,
+        version=event.version,
+        changes=tuple(changes.values()),
+        value=event.value,
+    )
+
+
+async def iter_updates(
+    coordinators: Iterable[ArknightsDataUpdateCoordinator],
+    categories: Iterable[str] | None = None,
+    max_pending: int = UPDATES_MAX_PENDING,
+) -> AsyncIterator[ChangeEvent]:
+    """逐个产出账号数据的变化事件。
+
+    从开始迭代时的数据开始比较，之后每次协调器更新（包括理智等推算值变化）
+    产生对应类别的事件。迭代器关闭时自动取消监听。
+
+    Args:
+        coordinators: 要监听的协调器
+        categories: 只关注的类别，为空则全部
+        max_pending: 待处理事件（合并后）的上限，超出时丢弃最旧的事件
+
+    Yields:
+        变化事件
+    """
+    wanted = set(categories) if categories is not None else None
+    pending: OrderedDict[tuple[str, str], ChangeEvent] = OrderedDict()
+    wakeup = asyncio.Event()
+    unsubs: list[CALLBACK_TYPE] = []
+    dropped = 0
+
+    def _watch(coordinator: ArknightsDataUpdateCoordinator) -> CALLBACK_TYPE:
+        cached = get_account_payload(coordinator)
+        last_version, last_payload = cached if cached else (None, None)
+
+        @callback
+        def _async_on_update() -> None:
+            nonlocal last_version, last_payload, dropped
+            cached = get_account_payload(coordinator)
+            if cached is None or cached[0] == last_version:
+                return
+            version, payload = cached
+            events = build_change_events(coordinator.uid, version, last_payload, payload)
+            last_version, last_payload = version, payload
+
+            for event in events:
+                if wanted is not None and event.category not in wanted:
+                    continue
+                key = (event.uid, event.category)
+                if key in pending:
+                    pending[key] = _merge(pending.pop(key), event)
+                else:
+                    if len(pending) >= max_pending:
+                        pending.popitem(last=False)
+                        dropped += 1
+                        _LOGGER.debug("变化事件缓冲已满，累计丢弃 %d 个", dropped)
+                    pending[key] = event
+            if pending:
+                wakeup.set()
+
+        return coordinator.async_add_listener(_async_on_update)
+
+    for coordinator in coordinators:
+        unsubs.append(_watch(coordinator))
+
+    try:
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+            while pending:
+                _, event = pending.popitem(last=False)
+                yield event
+    finally:
+        for unsub in unsubs:
+            unsub()
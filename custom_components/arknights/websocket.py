@@ -4,20 +4,34 @@
 """
 
 import logging
+from datetime import timedelta
+
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import DOMAIN, DATA_UID_INDEX, SIGNAL_ENTRY_UNLOADED
+from .history import (
+    DOWNSAMPLE_LTTB,
+    DOWNSAMPLE_METHODS,
+    async_get_recorder_series,
+    downsample,
+)
+from .timeseries import TIMESERIES_METRICS
+from .payload import diff_payload, get_account_payload, project_payload
 
 _LOGGER = logging.getLogger(__name__)
 
-
 async def async_register_websocket_api(hass: HomeAssistant) -> None:
     """注册 WebSocket API 命令。"""
     websocket_api.async_register_command(hass, ws_list_accounts)
     websocket_api.async_register_command(hass, ws_get_account_data)
+    websocket_api.async_register_command(hass, ws_subscribe_account)
+    websocket_api.async_register_command(hass, ws_get_accounts)
+    websocket_api.async_register_command(hass, ws_history)
     _LOGGER.debug("WebSocket API 已注册")
 
 
@@ -44,11 +58,7 @@ def ws_list_accounts(
     """
     accounts = []
 
-    for entry_id, data in hass.data.get(DOMAIN, {}).items():
-        coordinator = data.get("coordinator")
-        if not coordinator:
-            continue
-
+    for coordinator in hass.data.get(DATA_UID_INDEX, {}).values():
         player = coordinator.data
         if player:
             accounts.append({
@@ -64,6 +74,7 @@ def ws_list_accounts(
     {
         vol.Required("type"): "arknights/get_account_data",
         vol.Required("uid"): str,
+        vol.Optional("since_version"): int,
     }
 )
 @callback
@@ -82,133 +93,246 @@ def ws_get_account_data(
         "sanity": { "current": 100, "max": 135, "minutes_to_full": 0 },
         "building": { ... } | null,
         ...
+        "version": 42
     }
+
+    若请求携带的 since_version 与当前版本一致，仅返回
+    {"version": 42, "not_modified": true}
     """
     uid = msg["uid"]
 
-    for entry_id, data in hass.data.get(DOMAIN, {}).items():
-        coordinator = data.get("coordinator")
-        if not coordinator:
-            continue
-
-        player = coordinator.data
-        if player and player.uid == uid:
-            # 构建响应数据
-            response = {
-                "uid": player.uid,
-                "name": player.name,
-                "level": player.level,
-                "avatar_url": player.avatar_url,
-                "secretary_id": player.secretary_id,
-                "secretary_skin_id": player.secretary_skin_id,
-                "resume": player.resume,
-                "main_stage_progress": player.main_stage_progress,
-                "char_count": player.char_count,
-                "furniture_count": player.furniture_count,
-                "skin_count": player.skin_count,
-                "register_ts": player.register_ts,
-                "last_online_ts": player.last_online_ts,
-                # 理智
-                "sanity": {
-                    "current": player.sanity.current_now,
-                    "max": player.sanity.max,
-                    "minutes_to_full": player.sanity.minutes_to_full,
-                    "complete_recovery_time": player.sanity.complete_recovery_time,
-                },
-            }
-
-            # 基建信息（可能为 None）
-            if player.building:
-                # 线索板详情：显示1-7哪个有哪个没有
-                clue_map = {
-                    "RHINE": 1,
-                    "PENGUIN": 2,
-                    "BLACKSTEEL": 3,
-                    "URSUS": 4,
-                    "GLASGOW": 5,
-                    "KJERAG": 6,
-                    "RHODES": 7,
-                }
-                clue_board_status = {}
-                for name, slot_id in clue_map.items():
-                    clue_board_status[slot_id] = name in player.building.clue_board
-
-                response["building"] = {
-                    "trading_stock": player.building.trading_stock,
-                    "trading_stock_limit": player.building.trading_stock_limit,
-                    "manufacture_complete": player.building.manufacture_complete,
-                    "manufacture_capacity": player.building.manufacture_capacity,
-                    "drone_current": player.building.drone_current,
-                    "drone_max": player.building.drone_max,
-                    "training_state": player.building.training_state,
-                    "training_remaining_secs": player.building.training_remaining_secs,
-                    "trainee_char_id": player.building.trainee_char_id,
-                    "hire_refresh_count": player.building.hire_refresh_count,
-                    "recruit_finished": player.building.recruit_finished,
-                    "recruit_total": player.building.recruit_total,
-                    "resting_count": player.building.resting_count,
-                    "rested_count": player.building.rested_count,
-                    "clue_own": player.building.clue_own,
-                    "clue_received": player.building.clue_received,
-                    "clue_collected": player.building.clue_collected,
-                    "clue_board": clue_board_status,
-                    "tired_count": player.building.tired_count,
-                }
-            else:
-                response["building"] = None
-
-            # 蚀刻章
-            response["medal_count"] = player.medal_count
-
-            # 剿灭
-            if player.campaign:
-                response["campaign"] = {
-                    "current": player.campaign.current,
-                    "total": player.campaign.total,
-                }
-            else:
-                response["campaign"] = None
-
-            # 日/周常任务
-            if player.routine:
-                response["routine"] = {
-                    "daily_current": player.routine.daily_current,
-                    "daily_total": player.routine.daily_total,
-                    "weekly_current": player.routine.weekly_current,
-                    "weekly_total": player.routine.weekly_total,
-                }
-            else:
-                response["routine"] = None
-
-            # 保全派驻
-            if player.tower:
-                response["tower"] = {
-                    "higher_current": player.tower.higher_current,
-                    "higher_total": player.tower.higher_total,
-                    "lower_current": player.tower.lower_current,
-                    "lower_total": player.tower.lower_total,
-                    "term_ts": player.tower.term_ts,
-                }
-            else:
-                response["tower"] = None
-
-            # 助战干员
-            response["assist_chars"] = [
-                {
-                    "char_id": ac.char_id,
-                    "skin_id": ac.skin_id,
-                    "level": ac.level,
-                    "evolve_phase": ac.evolve_phase,
-                    "potential_rank": ac.potential_rank,
-                    "skill_id": ac.skill_id,
-                    "skill_level": ac.skill_level,
-                    "specialize_level": ac.specialize_level,
-                }
-                for ac in player.assist_chars
-            ]
-
-            connection.send_result(msg["id"], response)
-            return
+    coordinator = hass.data.get(DATA_UID_INDEX, {}).get(uid)
+    cached = get_account_payload(coordinator) if coordinator else None
+    if cached:
+        version, payload = cached
+        if msg.get("since_version") == version:
+            connection.send_result(msg["id"], {"version": version, "not_modified": True})
+        else:
+            connection.send_result(msg["id"], payload)
+        return
 
     # 未找到账号
     connection.send_error(msg["id"], "not_found", f"账号 {uid} 未找到")
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "arknights/subscribe_account",
+        vol.Required("uid"): str,
+    }
+)
+@callback
+def ws_subscribe_account(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """订阅账号数据变化。
+
+    订阅成功后先推送一次完整快照：
+    {"version": 42, "snapshot": { ...与 get_account_data 相同... } | null}
+
+    之后在协调器更新或理智等推算值变化时只推送变化字段：
+    {"version": 43, "patch": [{"op": "replace", "path": "/sanity/current", "value": 101}]}
+
+    账号的配置条目卸载（包括重新加载）时推送 {"closed": true} 并结束订阅，
+    客户端需要重新订阅。
+    """
+    uid = msg["uid"]
+
+    coordinator = hass.data.get(DATA_UID_INDEX, {}).get(uid)
+    if coordinator is None:
+        connection.send_error(msg["id"], "not_found", f"账号 {uid} 未找到")
+        return
+
+    cached = get_account_payload(coordinator)
+    last_version, last_payload = cached if cached else (None, None)
+
+    @callback
+    def _async_forward_update() -> None:
+        """推送与上次发送内容之间的增量。"""
+        nonlocal last_version, last_payload
+        cached = get_account_payload(coordinator)
+        if cached is None or cached[0] == last_version:
+            return
+
+        version, payload = cached
+        patch = diff_payload(last_payload, payload)
+        last_version, last_payload = version, payload
+        if patch:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {"version": version, "patch": patch}
+                )
+            )
+
+    remove_listener = coordinator.async_add_listener(_async_forward_update)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """取消订阅。"""
+        remove_listener()
+        remove_dispatcher()
+
+    @callback
+    def _async_close() -> None:
+        """配置条目已卸载，协调器不再更新，结束订阅。"""
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        _async_unsubscribe()
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"closed": True})
+        )
+
+    remove_dispatcher = async_dispatcher_connect(
+        hass, SIGNAL_ENTRY_UNLOADED.format(coordinator.entry_id), _async_close
+    )
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"], {"version": last_version, "snapshot": last_payload}
+        )
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "arknights/get_accounts",
+        vol.Optional("uids"): [str],
+        vol.Optional("fields"): [str],
+    }
+)
+@callback
+def ws_get_accounts(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """批量获取多个账号的数据。
+
+    uids 省略时返回全部账号；fields 省略时返回完整数据，
+    否则只返回所选字段（如 ["sanity", "building.drone_current"]）。
+
+    返回格式:
+    {
+        "accounts": [
+            {"uid": "12345678", "version": 42, "sanity": {...}, "building": {"drone_current": 180}},
+            ...
+        ],
+        "not_found": ["87654321"]
+    }
+    """
+    index = hass.data.get(DATA_UID_INDEX, {})
+    uids = msg.get("uids")
+    if uids is None:
+        uids = list(index)
+    fields = msg.get("fields")
+
+    accounts = []
+    not_found = []
+    for uid in uids:
+        coordinator = index.get(uid)
+        cached = get_account_payload(coordinator) if coordinator else None
+        if cached is None:
+            not_found.append(uid)
+            continue
+
+        version, payload = cached
+        if fields is None:
+            accounts.append(payload)
+        else:
+            accounts.append(
+                {"uid": uid, "version": version, **project_payload(payload, fields)}
+            )
+
+    connection.send_result(msg["id"], {"accounts": accounts, "not_found": not_found})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "arknights/history",
+        vol.Required("uid"): str,
+        vol.Required("metric"): str,
+        vol.Optional("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("points", default=300): vol.All(
+            vol.Coerce(int), vol.Range(min=3, max=5000)
+        ),
+        vol.Optional("method", default=DOWNSAMPLE_LTTB): vol.In(DOWNSAMPLE_METHODS),
+    }
+)
+@websocket_api.async_response
+async def ws_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """获取降采样后的指标历史。
+
+    start_time 省略时默认为 24 小时前，end_time 省略时默认为当前时间。
+
+    返回格式:
+    {
+        "uid": "12345678",
+        "metric": "sanity",
+        "source": "timeseries",
+        "raw_count": 1440,
+        "points": [[1706679000.0, 120.0], ...]
+    }
+    """
+    uid = msg["uid"]
+    metric = msg["metric"]
+
+    try:
+        end_time = (
+            dt_util.parse_datetime(msg["end_time"])
+            if "end_time" in msg
+            else dt_util.utcnow()
+        )
+        start_time = (
+            dt_util.parse_datetime(msg["start_time"])
+            if "start_time" in msg
+            else end_time and end_time - timedelta(days=1)
+        )
+    except ValueError:
+        start_time = end_time = None
+    if start_time is None or end_time is None:
+        connection.send_error(msg["id"], "invalid_format", "时间格式无效")
+        return
+    # 未带时区的时间按本地时区处理
+    start_time = dt_util.as_utc(start_time)
+    end_time = dt_util.as_utc(end_time)
+
+    # 优先使用集成自有的时间序列存储，其中没有的指标再查询记录器
+    series = None
+    source = "timeseries"
+    coordinator = hass.data.get(DATA_UID_INDEX, {}).get(uid)
+    if coordinator is not None and metric in TIMESERIES_METRICS:
+        entry_data = hass.data[DOMAIN][coordinator.entry_id]
+        series = await entry_data["timeseries"].async_read(
+            metric, start_time.timestamp(), end_time.timestamp()
+        )
+    elif "recorder" in hass.config.components:
+        source = "recorder"
+        series = await async_get_recorder_series(
+            hass, uid, metric, start_time, end_time
+        )
+    else:
+        connection.send_error(msg["id"], "not_supported", "记录器未启用")
+        return
+
+    if series is None:
+        connection.send_error(msg["id"], "not_found", f"账号 {uid} 的指标 {metric} 未找到")
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "uid": uid,
+            "metric": metric,
+            "source": source,
+            "raw_count": len(series),
+            "points": downsample(series, msg["points"], msg["method"]),
+        },
+    )
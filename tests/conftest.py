@@ -0,0 +1,13 @@
+"""测试配置。
+
+api 包不依赖 Home Assistant，其测试直接从集成目录导入
+（与命令行工具 python -m api.cli 的用法一致）；
+依赖 Home Assistant 的测试从仓库根目录以 custom_components.arknights 导入。
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "custom_components" / "arknights"))
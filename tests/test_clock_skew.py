@@ -0,0 +1,82 @@
+"""SklandClient 时钟偏差修正测试。"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from api.client import SklandClient  # noqa: E402
+from api.clock import ManualClock  # noqa: E402
+from api.models import Credential  # noqa: E402
+
+SERVER_TIME = 1_700_000_000.0
+SKEW = 3600.0
+MAX_TIMESTAMP_DRIFT = 60
+"""模拟服务端允许的签名时间戳误差（秒）"""
+
+
+class _FakeResponse:
+    """模拟响应。"""
+
+    def __init__(self, data: dict) -> None:
+        self._data = data
+        self.headers: dict[str, str] = {}
+
+    async def json(self) -> dict:
+        return self._data
+
+    async def __aenter__(self) -> "_FakeResponse":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class _FakeSession:
+    """模拟森空岛服务端：签名时间戳与服务器时间相差过大时返回认证失败。"""
+
+    def __init__(self, server_time: float) -> None:
+        self.server_time = server_time
+        self.timestamps: list[int] = []
+
+    def get(self, url: str, headers: dict, **kwargs) -> _FakeResponse:
+        timestamp = int(headers["timestamp"])
+        self.timestamps.append(timestamp)
+        data: dict = {"timestamp": str(int(self.server_time))}
+        if abs(timestamp - self.server_time) > MAX_TIMESTAMP_DRIFT:
+            data.update(code=10000, message="请求异常")
+        else:
+            data.update(code=0, data={"list": []})
+        return _FakeResponse(data)
+
+
+def _make_client(session: _FakeSession, clock: ManualClock) -> SklandClient:
+    return SklandClient(Credential(cred="cred", token="token"), session, clock=clock)
+
+
+def test_retries_once_and_converges_when_local_clock_is_ahead() -> None:
+    """本地时钟快 1 小时：首次请求失败后按修正后的时间戳重试一次并成功。"""
+    session = _FakeSession(SERVER_TIME)
+    clock = ManualClock(SERVER_TIME + SKEW)
+    client = _make_client(session, clock)
+
+    assert asyncio.run(client.get_binding()) == []
+    assert len(session.timestamps) == 2
+    assert client.clock_offset == pytest.approx(-SKEW, abs=1)
+    assert abs(session.timestamps[-1] - SERVER_TIME) <= MAX_TIMESTAMP_DRIFT
+
+    # 偏差已知后不再重试
+    asyncio.run(client.get_binding())
+    assert len(session.timestamps) == 3
+    assert client.clock_offset == pytest.approx(-SKEW, abs=1)
+
+
+def test_no_retry_without_skew() -> None:
+    """本地时钟准确时只请求一次。"""
+    session = _FakeSession(SERVER_TIME)
+    client = _make_client(session, ManualClock(SERVER_TIME))
+
+    asyncio.run(client.get_binding())
+    assert len(session.timestamps) == 1
+    assert client.clock_offset == pytest.approx(0, abs=1)
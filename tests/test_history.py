@@ -0,0 +1,67 @@
+"""历史数据降采样测试。"""
+
+import math
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.arknights.history import (  # noqa: E402
+    DOWNSAMPLE_LTTB,
+    DOWNSAMPLE_MINMAX,
+    downsample,
+    lttb,
+    minmax_buckets,
+)
+
+LARGE_SERIES_SIZE = 500_000
+"""大序列样本数（约为一年每分钟一个样本）"""
+LARGE_SERIES_LIMIT = 5.0
+"""大序列降采样的耗时上限（秒）"""
+
+
+def _series(count: int) -> list[tuple[float, float]]:
+    """生成带一个尖峰的正弦序列。"""
+    points = [(1_700_000_000.0 + i * 60, math.sin(i / 500) * 100) for i in range(count)]
+    points[count // 3] = (points[count // 3][0], 1000.0)
+    return points
+
+
+def test_short_series_returned_unchanged() -> None:
+    """样本数不超过目标点数时原样返回。"""
+    points = _series(10)
+    assert lttb(points, 300) == points
+    assert minmax_buckets(points, 300) == points
+
+
+def test_lttb_keeps_endpoints_and_peak() -> None:
+    """LTTB 返回目标点数，保留首尾与尖峰。"""
+    points = _series(10_000)
+    sampled = lttb(points, 300)
+    assert len(sampled) == 300
+    assert sampled[0] == points[0]
+    assert sampled[-1] == points[-1]
+    assert points[len(points) // 3] in sampled
+    assert sampled == sorted(sampled)
+
+
+def test_minmax_keeps_extremes() -> None:
+    """最小/最大值分桶保留全局极值，且不超过目标点数。"""
+    points = _series(10_000)
+    sampled = minmax_buckets(points, 300)
+    assert len(sampled) <= 300
+    assert max(sampled, key=lambda p: p[1]) == max(points, key=lambda p: p[1])
+    assert min(sampled, key=lambda p: p[1]) == min(points, key=lambda p: p[1])
+    assert sampled == sorted(sampled)
+
+
+@pytest.mark.parametrize("method", [DOWNSAMPLE_LTTB, DOWNSAMPLE_MINMAX])
+def test_large_series(method: str) -> None:
+    """大序列降采样在耗时上限内完成。"""
+    points = _series(LARGE_SERIES_SIZE)
+    started = time.perf_counter()
+    sampled = downsample(points, 1000, method)
+    elapsed = time.perf_counter() - started
+    assert len(sampled) <= 1000
+    assert elapsed < LARGE_SERIES_LIMIT, f"{method} 降采样耗时 {elapsed:.2f} 秒"
@@ -0,0 +1,88 @@
+"""集成导入耗时基准。
+
+以 python -X importtime 在子进程中导入集成，统计集成自身的累计导入耗时
+（Home Assistant 及第三方依赖预先导入，不计入），超过上限时失败；
+同时检查按需导入的模块没有在加载集成时被导入。
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+ROOT = Path(__file__).parent.parent
+PACKAGE = "custom_components.arknights"
+
+IMPORT_TIME_LIMIT_US = 150_000
+"""集成自身的累计导入耗时上限（微秒）"""
+
+PRELOAD = (
+    "voluptuous",
+    "aiohttp",
+    "homeassistant.core",
+    "homeassistant.const",
+    "homeassistant.config_entries",
+    "homeassistant.exceptions",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+)
+"""集成依赖的外部模块，预先导入以免计入集成的导入耗时"""
+
+LAZY_MODULES = (
+    f"{PACKAGE}.api.auth",
+    f"{PACKAGE}.websocket",
+    f"{PACKAGE}.statistics",
+)
+"""只在首次使用时才导入的模块"""
+
+
+def _import_package() -> tuple[int, set[str]]:
+    """在子进程中导入集成。
+
+    Returns:
+        (集成的累计导入耗时（微秒）, 已导入的集成模块)
+    """
+    code = (
+        f"import {', '.join(PRELOAD)}\n"
+        f"import {PACKAGE}\n"
+        "import sys\n"
+        f"print('\\n'.join(m for m in sys.modules if m.startswith({PACKAGE!r})))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) == 3 and fields[2].strip() == PACKAGE:
+            cumulative = int(fields[1])
+    assert cumulative is not None, proc.stderr
+    return cumulative, set(proc.stdout.split())
+
+
+def test_import_time_within_limit() -> None:
+    """集成的导入耗时不超过上限。"""
+    cumulative, _ = _import_package()
+    assert cumulative <= IMPORT_TIME_LIMIT_US, (
+        f"导入 {PACKAGE} 耗时 {cumulative / 1000:.1f} ms，"
+        f"超过上限 {IMPORT_TIME_LIMIT_US / 1000:.0f} ms"
+    )
+
+
+def test_deferred_modules_not_imported() -> None:
+    """认证、WebSocket 与统计模块不在加载集成时导入。"""
+    _, modules = _import_package()
+    assert not modules & set(LAZY_MODULES)
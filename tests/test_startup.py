@@ -0,0 +1,93 @@
+"""启动基准：从快照恢复与首次网络刷新的耗时对比。
+
+配置条目设置时，有快照则先从快照恢复实体并在后台刷新，否则阻塞等待
+首次刷新。以带固定网络延迟的模拟客户端比较两条路径，
+快照恢复的耗时应与网络无关且接近零。
+"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.arknights.api import Credential, CredentialManager  # noqa: E402
+from custom_components.arknights.api.client import parse_player_info  # noqa: E402
+from custom_components.arknights.const import (  # noqa: E402
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from custom_components.arknights.coordinator import (  # noqa: E402
+    ArknightsDataUpdateCoordinator,
+)
+
+ENTRY_ID = "startup_benchmark"
+NETWORK_LATENCY = 0.5
+"""模拟的单次玩家数据请求耗时（秒）"""
+RESTORE_LIMIT = 0.05
+"""从快照恢复的耗时上限（秒）"""
+
+NOW = 1_700_000_000.0
+PLAYER = parse_player_info(
+    {
+        "status": {
+            "uid": "12345678",
+            "name": "Doctor",
+            "level": 120,
+            "ap": {"current": 100, "max": 135, "completeRecoveryTime": NOW + 3600},
+        }
+    },
+    NOW,
+)
+
+
+class _SlowClient:
+    """带固定网络延迟的模拟客户端。"""
+
+    credential = Credential(cred="cred", token="token")
+
+    async def get_player_info(self, uid: str):
+        await asyncio.sleep(NETWORK_LATENCY)
+        return PLAYER
+
+
+def _make_coordinator(hass, entry_id: str | None) -> ArknightsDataUpdateCoordinator:
+    return ArknightsDataUpdateCoordinator(
+        hass,
+        _SlowClient(),
+        uid=PLAYER.uid,
+        nickname=PLAYER.name,
+        original_token="token",
+        credentials=CredentialManager(lambda: None),
+        update_interval=None,
+        entry_id=entry_id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_restore_from_snapshot_does_not_wait_for_network(hass, hass_storage) -> None:
+    """有快照时恢复耗时接近零；无快照时首次刷新受网络延迟限制。"""
+    key = f"{SNAPSHOT_STORAGE_KEY}.{ENTRY_ID}"
+    hass_storage[key] = {
+        "version": SNAPSHOT_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": key,
+        "data": {"player": PLAYER.as_dict()},
+    }
+
+    warm = _make_coordinator(hass, ENTRY_ID)
+    started = time.perf_counter()
+    assert await warm.async_restore_snapshot()
+    restore_time = time.perf_counter() - started
+    assert warm.data == PLAYER
+
+    # 无快照（不持久化）时只能等待首次刷新
+    cold = _make_coordinator(hass, None)
+    started = time.perf_counter()
+    await cold.async_refresh()
+    refresh_time = time.perf_counter() - started
+    assert cold.data == PLAYER
+
+    assert restore_time < RESTORE_LIMIT
+    assert refresh_time >= NETWORK_LATENCY